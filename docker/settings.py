@@ -6,6 +6,19 @@ INSTALLED_APPS += [
     'compressor'
 ]
 
+MIDDLEWARE += [
+    'rttlinfo.middleware.RequestMemoMiddleware',
+]
+# After the security and clickjacking headers, before anything that reads
+# the session
+MIDDLEWARE.insert(
+    max([MIDDLEWARE.index(name) for name in (
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware')
+        if name in MIDDLEWARE] + [-1]) + 1,
+    'rttlinfo.middleware.SessionlessApiMiddleware')
+MIDDLEWARE.insert(0, 'rttlinfo.middleware.ServerTimingMiddleware')
+
 COMPRESS_ENABLED = True
 # Override the base container's STATIC_ROOT to match where files are collected
 STATIC_ROOT = '/static'
@@ -0,0 +1,131 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import csv
+import json
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from logging import getLogger
+from .dataclasses import AdminCourseSettings
+logger = getLogger(__name__)
+
+EXPORT_FIELDS = (
+    'id', 'key', 'name', 'sis_course_id', 'hub_status', 'hub_url',
+    'last_changed', 'image_repo', 'image_tag', 'storage_capacity',
+    'cpu_request', 'cpu_limit', 'memory_request', 'memory_limit',
+    'features', 'extra_envs', 'git_puller_targets')
+FEATURES = ('nfs', 'binderhub', 'nocanvas', 'oidcauth')
+
+
+def iter_admin_course_details(client, concurrency=4):
+    """
+    Yield the details of every admin course as they arrive, fetching at
+    most `concurrency` at once and holding at most twice that many
+    results. Courses whose details cannot be fetched are logged and
+    skipped.
+    """
+    course_ids = iter([course['id'] for course in
+                       client.list_admin_courses(use_cache=False)])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+
+        def submit_next():
+            for course_id in course_ids:
+                future = executor.submit(
+                    client.get_admin_course, course_id, use_cache=False)
+                pending[future] = course_id
+                return
+
+        for _ in range(concurrency * 2):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                course_id = pending.pop(future)
+                submit_next()
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(f"Error exporting admin course "
+                                 f"{course_id}: {e}")
+
+
+def get_export_row(detail):
+    """
+    Flatten an admin course detail record into the EXPORT_FIELDS. Only
+    the names of extra environment variables are exported, as their
+    values may be secrets.
+    """
+    settings = AdminCourseSettings.from_api_data(detail['settings'])
+    image = settings.image
+    return {
+        'id': detail['id'],
+        'key': detail.get('key'),
+        'name': detail.get('name'),
+        'sis_course_id': detail.get('sis_course_id'),
+        'hub_status': detail.get('hub_status'),
+        'hub_url': detail.get('hub_url'),
+        'last_changed': detail.get('last_changed'),
+        'image_repo': image.repo if image else None,
+        'image_tag': settings.image_tag or (image.tag if image else None),
+        'storage_capacity': settings.storage_capacity,
+        'cpu_request': settings.cpu_request,
+        'cpu_limit': settings.cpu_limit,
+        'memory_request': settings.memory_request,
+        'memory_limit': settings.memory_limit,
+        'features': [name for name in FEATURES
+                     if getattr(settings, f'feature_{name}')],
+        'extra_envs': [env.key for env in settings.extra_envs],
+        'git_puller_targets': [
+            f"{target.repo}@{target.branch} -> {target.target_dir}"
+            for target in settings.git_puller_targets],
+    }
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+
+def iter_csv(rows):
+    class Echo:
+        def write(self, value):
+            return value
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(
+            ['; '.join(value) if isinstance(value, list) else value
+             for value in (row[name] for name in EXPORT_FIELDS)])
+
+
+def iter_gzip(chunks):
+    """
+    Gzip a stream of text chunks without buffering the whole stream.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_admin_courses(client, export_format='ndjson', concurrency=4):
+    """
+    Yield the admin course export as text chunks, in 'ndjson' or 'csv'.
+    """
+    def rows():
+        for detail in iter_admin_course_details(client, concurrency):
+            try:
+                yield get_export_row(detail)
+            except Exception as e:
+                logger.error(f"Error exporting admin course "
+                             f"{detail.get('id')}: {e}")
+
+    if export_format == 'csv':
+        return iter_csv(rows())
+    return iter_ndjson(rows())
@@ -0,0 +1,179 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import threading
+import time
+from logging import getLogger
+from django.conf import settings
+from rttlinfo.api.clients.rate_limit import BACKGROUND, INTERACTIVE
+logger = getLogger(__name__)
+
+# Upstream calls in flight per worker process, calls that may wait for one
+# to finish, and the longest they wait before being shed
+DEFAULT_LIMITS = {INTERACTIVE: 8, BACKGROUND: 4}
+DEFAULT_QUEUE_SIZES = {INTERACTIVE: 16, BACKGROUND: 32}
+DEFAULT_MAX_WAITS = {INTERACTIVE: 2, BACKGROUND: 30}
+# Seconds between INFO logs of each process's pool metrics
+DEFAULT_STATS_INTERVAL = 60
+
+_bulkhead = None
+_bulkhead_lock = threading.Lock()
+
+
+class _Pool:
+    def __init__(self, limit, queue_size, max_wait):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self._condition = threading.Condition()
+
+    def _take(self):
+        # Queued calls go first, so a steady stream of new calls cannot keep
+        # them waiting until they time out
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        return False
+
+    def try_acquire(self):
+        with self._condition:
+            return self._take()
+
+    def acquire(self, max_wait):
+        with self._condition:
+            if self._take():
+                return True
+            if max_wait <= 0 or self.queued >= self.queue_size:
+                self.shed += 1
+                return False
+
+            self.queued += 1
+            try:
+                deadline = time.monotonic() + max_wait
+                while self.in_flight >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        return False
+                    self._condition.wait(remaining)
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.queued -= 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def stats(self):
+        with self._condition:
+            return {'limit': self.limit, 'in_flight': self.in_flight,
+                    'queued': self.queued, 'queue_size': self.queue_size,
+                    'admitted': self.admitted, 'shed': self.shed}
+
+
+class Bulkhead:
+    """
+    Per-process limits on concurrent RTTL API calls, with separate pools
+    for interactive and background traffic, so that a slow upstream ties
+    up at most `limit` of a worker's threads per pool rather than all of
+    them, and background work cannot crowd out user requests.
+
+    A call over the limit waits in its pool's queue for a slot. If the
+    queue is full, or no slot frees up within the pool's max wait, the
+    call is shed and the caller falls back to stale or degraded data.
+
+    Each pool's in-flight calls, queue depth, and calls admitted and shed
+    so far are logged at INFO every stats_interval seconds while there is
+    traffic.
+    """
+
+    def __init__(self, limits, queue_sizes, max_waits, stats_interval=None):
+        self._pools = {
+            pool: _Pool(limit, queue_sizes.get(pool, 0),
+                        max_waits.get(pool, 0))
+            for pool, limit in limits.items() if limit}
+        if stats_interval and self._pools:
+            threading.Thread(target=self._log_stats, args=(stats_interval,),
+                             daemon=True, name="rttl-bulkhead-stats").start()
+
+    def acquire(self, pool, max_wait=None):
+        """
+        Take a slot in a pool, waiting at most max_wait seconds (by
+        default, the pool's configured wait) if it is full. Returns
+        whether a slot was taken; if so, it must be released.
+        """
+        if pool not in self._pools:
+            return True
+        if max_wait is None:
+            max_wait = self._pools[pool].max_wait
+        if self._pools[pool].acquire(max_wait):
+            return True
+        logger.warning(f"Shed RTTL API call from the {pool} pool: "
+                       f"{self._pools[pool].stats()}")
+        return False
+
+    def try_acquire(self, pool):
+        """
+        Take a slot in a pool only if one is free now, for optional calls
+        such as hedges; one that is not taken is not counted as shed.
+        """
+        return pool not in self._pools or self._pools[pool].try_acquire()
+
+    def release(self, pool):
+        if pool in self._pools:
+            self._pools[pool].release()
+
+    def stats(self):
+        """
+        In-flight calls, queue depth and calls shed so far, by pool.
+        """
+        return {pool: self._pools[pool].stats() for pool in self._pools}
+
+    def _log_stats(self, interval):
+        last = None
+        while True:
+            time.sleep(interval)
+            stats = self.stats()
+            activity = {pool: (pool_stats['admitted'], pool_stats['shed'])
+                        for pool, pool_stats in stats.items()}
+            busy = any(pool_stats['in_flight'] or pool_stats['queued']
+                       for pool_stats in stats.values())
+            if busy or activity != last:
+                logger.info(f"RTTL API bulkhead (pid {os.getpid()}): "
+                            f"{stats}")
+            last = activity
+
+
+def get_bulkhead():
+    """
+    Return this process's Bulkhead, configured by RTTL_API_BULKHEAD_LIMITS,
+    RTTL_API_BULKHEAD_QUEUE_SIZES and RTTL_API_BULKHEAD_WAITS, dicts keyed
+    by pool that are merged over the defaults, and logging its metrics
+    every RTTL_API_BULKHEAD_STATS_INTERVAL seconds (None disables). Returns
+    None if RTTL_API_BULKHEAD_LIMITS is None.
+    """
+    global _bulkhead
+    limits = getattr(settings, 'RTTL_API_BULKHEAD_LIMITS', {})
+    if limits is None:
+        return None
+    with _bulkhead_lock:
+        # Forked workers each get their own, not a copy of the parent's
+        if _bulkhead is None or _bulkhead[0] != os.getpid():
+            _bulkhead = (os.getpid(), Bulkhead(
+                dict(DEFAULT_LIMITS, **limits),
+                dict(DEFAULT_QUEUE_SIZES, **getattr(
+                    settings, 'RTTL_API_BULKHEAD_QUEUE_SIZES', {})),
+                dict(DEFAULT_MAX_WAITS, **getattr(
+                    settings, 'RTTL_API_BULKHEAD_WAITS', {})),
+                getattr(settings, 'RTTL_API_BULKHEAD_STATS_INTERVAL',
+                        DEFAULT_STATS_INTERVAL)))
+        return _bulkhead[1]
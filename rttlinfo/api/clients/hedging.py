@@ -0,0 +1,132 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from logging import getLogger
+from django.conf import settings
+logger = getLogger(__name__)
+
+_hedger = None
+_hedger_lock = threading.Lock()
+
+
+class Hedger:
+    """
+    Hedged requests: if an idempotent request has not completed within
+    the endpoint's recent p`percentile` latency, a second identical
+    request is sent and whichever completes first is used. The other is
+    left to finish in the background and its response discarded.
+
+    An endpoint is not hedged until it has min_samples latencies, and at
+    most max_ratio of the last `window` requests are hedged, so a slow
+    upstream is not sent much more load than it already has.
+    """
+    window = 1000
+    samples = 200
+    min_threshold = 0.05
+
+    def __init__(self, percentile, max_ratio, min_samples, max_workers):
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self._latencies = {}
+        self._hedged = deque(maxlen=self.window)
+        self._hedge_count = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='rttl-hedge')
+
+    def threshold(self, endpoint):
+        """
+        Seconds to wait before hedging a request to an endpoint, or None
+        if there are too few latencies to tell.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        rank = max(0, math.ceil(self.percentile / 100 * len(latencies)) - 1)
+        return max(self.min_threshold, latencies[rank])
+
+    def _record(self, endpoint, elapsed):
+        with self._lock:
+            if endpoint not in self._latencies:
+                self._latencies[endpoint] = deque(maxlen=self.samples)
+            self._latencies[endpoint].append(elapsed)
+
+    def _count(self, hedged):
+        with self._lock:
+            if len(self._hedged) == self.window:
+                self._hedge_count -= self._hedged[0]
+            self._hedged.append(hedged)
+            self._hedge_count += hedged
+
+    def _may_hedge(self):
+        with self._lock:
+            return self._hedge_count + 1 <= \
+                self.max_ratio * max(len(self._hedged), self.min_samples)
+
+    def _submit(self, endpoint, send):
+        start = time.perf_counter()
+
+        def record(future):
+            if future.exception() is None:
+                self._record(endpoint, time.perf_counter() - start)
+
+        future = self._executor.submit(send)
+        future.add_done_callback(record)
+        return future
+
+    def request(self, endpoint, send, can_hedge=None):
+        """
+        Return send(), hedged as described above. can_hedge is called
+        before sending a hedge and may veto it, for example when the rate
+        limit is exhausted.
+        """
+        threshold = self.threshold(endpoint)
+        if threshold is None:
+            # Too few samples to hedge; time it for the threshold
+            start = time.perf_counter()
+            response = send()
+            self._record(endpoint, time.perf_counter() - start)
+            self._count(False)
+            return response
+
+        first = self._submit(endpoint, send)
+        done, _ = wait([first], timeout=threshold)
+        if done or not self._may_hedge() or \
+                (can_hedge is not None and not can_hedge()):
+            self._count(False)
+            return first.result()
+
+        self._count(True)
+        logger.debug(f"Hedging {endpoint} after {threshold * 1000:.0f} ms")
+        pending = {first, self._submit(endpoint, send)}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Prefer a response; raise only if both attempts failed
+            for future in sorted(
+                    done, key=lambda f: f.exception() is not None):
+                if future.exception() is None or not pending:
+                    return future.result()
+
+
+def get_hedger():
+    """
+    Return the process-wide Hedger if RTTL_API_HEDGE is set, else None.
+    """
+    global _hedger
+    if not getattr(settings, 'RTTL_API_HEDGE', False):
+        return None
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger(
+                getattr(settings, 'RTTL_API_HEDGE_PERCENTILE', 95),
+                getattr(settings, 'RTTL_API_HEDGE_MAX_RATIO', 0.05),
+                getattr(settings, 'RTTL_API_HEDGE_MIN_SAMPLES', 20),
+                getattr(settings, 'RTTL_API_HEDGE_WORKERS', 32))
+        return _hedger
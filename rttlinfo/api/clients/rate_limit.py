@@ -0,0 +1,97 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+import time
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+logger = getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+WRITE = 'write'
+
+# Requests per second across all workers and pods, and the longest a
+# request waits for a token before falling back to stale data or failing
+DEFAULT_RATES = {INTERACTIVE: 20, BACKGROUND: 5, WRITE: 5}
+DEFAULT_MAX_WAITS = {INTERACTIVE: 1, BACKGROUND: 30, WRITE: 0}
+
+
+class RateLimiter:
+    """
+    Token buckets for RTTL API requests, shared by every worker through
+    the Django cache. Each budget's bucket holds rate * window tokens and
+    is refilled at the start of every window.
+
+    The cache only offers atomic add and incr, so a bucket is a counter
+    of the tokens taken in the current window rather than a continuously
+    refilled balance. If the counter cannot be read, the request is
+    allowed, so a cache outage does not stop API traffic.
+    """
+    window = 1
+
+    def __init__(self, rates, max_waits):
+        self.rates = rates
+        self.max_waits = max_waits
+
+    def try_acquire(self, budget):
+        """
+        Take a token from a budget without waiting. Returns whether one
+        was available.
+        """
+        rate = self.rates.get(budget)
+        if not rate:
+            return True
+        key = f"rttl_rate_{budget}_{int(time.time() // self.window)}"
+        try:
+            try:
+                taken = cache.incr(key)
+            except ValueError:
+                # First request of the window, unless another worker has
+                # just added the counter
+                if cache.add(key, 1, timeout=self.window * 2 + 1):
+                    return True
+                taken = cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Error reading rate limit {key}: {e}")
+            return True
+        return taken <= rate * self.window
+
+    def acquire(self, budget, max_wait=None):
+        """
+        Take a token from a budget, waiting for the next window for at
+        most max_wait seconds (by default, the budget's configured wait).
+        Returns whether a token was taken.
+        """
+        if max_wait is None:
+            max_wait = self.max_waits.get(budget, 0)
+        deadline = time.monotonic() + max_wait
+        while not self.try_acquire(budget):
+            # Jittered, so waiting workers do not all retry at once
+            delay = self.retry_after() + random.uniform(0, 0.1)
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+        return True
+
+    def retry_after(self):
+        """
+        Seconds until the buckets are next refilled.
+        """
+        return self.window - time.time() % self.window
+
+
+def get_rate_limiter():
+    """
+    Return a RateLimiter configured by RTTL_API_RATE_LIMITS and
+    RTTL_API_RATE_LIMIT_WAITS, dicts keyed by budget that are merged over
+    the defaults. Setting RTTL_API_RATE_LIMITS to None disables limiting.
+    """
+    rates = getattr(settings, 'RTTL_API_RATE_LIMITS', {})
+    if rates is None:
+        return RateLimiter({}, {})
+    return RateLimiter(
+        dict(DEFAULT_RATES, **rates),
+        dict(DEFAULT_MAX_WAITS,
+             **getattr(settings, 'RTTL_API_RATE_LIMIT_WAITS', {})))
@@ -1,14 +1,29 @@
 import requests
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Union
 from django.conf import settings
 from django.core.cache import cache
 import hashlib
 import json
+import time
+from rttlinfo.sis_id import SisId
+from rttlinfo.api.clients.rate_limit import (
+    BACKGROUND, INTERACTIVE, WRITE, get_rate_limiter)
+from rttlinfo.api.clients.bulkhead import get_bulkhead
+from rttlinfo.api.clients.hedging import get_hedger
+from rttlinfo.api.clients.transport import SessionTransport, get_transport
+from rttlinfo.server_timing import count_hit, get_endpoint_metric, timed
 # from rttlinfo.dataclasses import Course, CourseStatus, CourseConfiguration
 
 logger = logging.getLogger(__name__)
 
+_sessions = {}
+_sessions_lock = threading.Lock()
+
 
 class RttlApiError(Exception):
     """
@@ -24,6 +39,50 @@ class RttlApiError(Exception):
         super().__init__(self.message)
 
 
+class RttlRateLimitError(RttlApiError):
+    """
+    The client's rate limit budget for a request is exhausted, so the
+    request was not sent. Retry after retry_after seconds.
+    """
+    def __init__(self, message: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(message, 429)
+
+
+class RttlOverloadedError(RttlRateLimitError):
+    """
+    Too many of this process's requests to the RTTL API are in flight, so
+    the request was shed without being sent.
+    """
+    def __init__(self, message: str, retry_after: float = 1):
+        super().__init__(message, retry_after)
+        self.status_code = 503
+
+
+class MockResponse:
+    """
+    A response served from the cache.
+    """
+    def __init__(self, data, status_code=200):
+        self._json = data
+        self.status_code = status_code
+        self.content = json.dumps(data).encode()
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        pass
+
+
+def _unpack_cached(entry):
+    # Cached responses are (time cached, data); entries written before
+    # that format count as fresh
+    if isinstance(entry, tuple):
+        return entry
+    return time.time(), entry
+
+
 class RttlApiClient:
     """
     Simplified API client for the RTTL REST API.
@@ -36,24 +95,26 @@ class RttlApiClient:
             base_url: str = None,
             api_key: str = None,
             version: str = "v1",
-            cache_timeout: int = 300):
+            cache_timeout: int = 300,
+            background: bool = False):
         self.base_url = base_url or getattr(
             settings, 'RTTL_BASE_URL', 'https://jupyter.eval.rttl.uw.edu')
         self.api_key = api_key or getattr(settings, 'RTTL_API_KEY', None)
         self.version = version
         self.cache_timeout = cache_timeout  # 5 minutes default
-        self.session = requests.Session()
+        # Background reads (warmers, exports, refreshes) are rate limited
+        # separately from reads on behalf of a user's request
+        self.background = background
+        self.rate_limiter = get_rate_limiter()
+        self.hedger = get_hedger()
+        self.bulkhead = get_bulkhead()
 
         if not self.api_key:
             raise ValueError("RTTL API key is required. Set RTTL_API_KEY in \
                              settings or pass api_key parameter.")
 
-        # Set default headers
-        self.session.headers.update({
-            'Authorization': f'Bearer Api-Key {self.api_key}',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+        self.session = _get_session(self.api_key)
+        self.transport = get_transport(self.session)
 
     def _get_url(self, endpoint: str) -> str:
         """
@@ -85,45 +146,99 @@ class RttlApiClient:
         # MD5 hash ensures key is exactly 32 chars + prefix, under 250 char limit
         return f"rttl_api_{hash_key}"
 
+    def _get_sis_id_params(self, sis_id, endpoint):
+        """
+        Query params and memoized cache key for an optional SIS ID filter.
+        """
+        if not sis_id:
+            return {}, None
+        sis_id = SisId.parse(sis_id)
+        return ({'sis_id': sis_id.value},
+                sis_id.cache_key(f"rttl_api_{self.version}_{endpoint}"))
+
     def _make_request(
             self,
             method: str,
             endpoint: str,
             use_cache: bool = True,
+            cache_key: str = None,
             **kwargs) -> requests.Response:
         """
         Make HTTP request with error handling, logging, and optional caching.
+        A precomputed cache_key may be passed to skip hashing the request.
         """
         url = self._get_url(endpoint)
 
-        # Check cache for GET requests
-        cache_key = None
+        # Check cache for GET requests. Entries outlive cache_timeout by
+        # RTTL_API_STALE_TIMEOUT, to be served if the rate limit is hit.
+        cached_at, cached_response = None, None
         if method == 'GET' and use_cache and self.cache_timeout > 0:
-            cache_key = self._get_cache_key(
+            cache_key = cache_key or self._get_cache_key(
                 method,
                 endpoint,
                 kwargs.get('params'))
-            cached_response = cache.get(cache_key)
-            if cached_response:
+            with timed('cache-shared', 'Shared cache'):
+                cached_at, cached_response = _unpack_cached(
+                    cache.get(cache_key))
+            if cached_response and \
+                    time.time() - cached_at < self.cache_timeout:
                 logger.debug(f"Cache hit: {method} {url}")
-
-                # Create a mock response object
-                class MockResponse:
-                    def __init__(self, data, status_code=200):
-                        self._json = data
-                        self.status_code = status_code
-                        self.content = json.dumps(data).encode()
-
-                    def json(self):
-                        return self._json
-
-                    def raise_for_status(self):
-                        pass
-
                 return MockResponse(cached_response)
 
+        # A slot in this process's pool is taken before a rate limit token,
+        # so that a shed request does not spend budget shared by all pods
+        pool = BACKGROUND if self.background else INTERACTIVE
+        if self.bulkhead is not None:
+            with timed('bulkhead', 'Upstream queue'):
+                admitted = self.bulkhead.acquire(
+                    pool, max_wait=0 if cached_response else None)
+            if not admitted:
+                count_hit('bulkhead-shed', 'Shed upstream calls')
+                if cached_response:
+                    age = time.time() - cached_at
+                    logger.warning(f"Overloaded, serving {age:.0f}s old "
+                                   f"response: {method} {url}")
+                    return MockResponse(cached_response)
+                raise RttlOverloadedError(
+                    f"Too many RTTL API {pool} requests in flight")
+
+        # The slot is released when the upstream call has finished, which
+        # for a hedged request may be after the hedge has been returned
+        sent = False
+
+        def send():
+            try:
+                return self.transport.request(method, url, **kwargs)
+            finally:
+                self._release(pool)
+
         try:
-            response = self.session.request(method, url, **kwargs)
+            budget = (BACKGROUND if self.background else INTERACTIVE) \
+                if method == 'GET' else WRITE
+            # Stale data now beats fresh data after waiting for a token
+            if not self.rate_limiter.acquire(
+                    budget, max_wait=0 if cached_response else None):
+                if cached_response:
+                    age = time.time() - cached_at
+                    logger.warning(f"Rate limited, serving {age:.0f}s old "
+                                   f"response: {method} {url}")
+                    return MockResponse(cached_response)
+                logger.warning(f"Rate limited: {method} {url}")
+                raise RttlRateLimitError(
+                    f"RTTL API {budget} rate limit exceeded",
+                    self.rate_limiter.retry_after())
+
+            metric = get_endpoint_metric(method, endpoint)
+            sent = True
+            with timed(*metric):
+                if method == 'GET' and self.hedger is not None:
+                    # A hedge is a second request, so it needs a slot and
+                    # a token too
+                    response = self.hedger.request(
+                        metric[0], send,
+                        lambda: self._acquire_hedge(pool, budget))
+                else:
+                    response = send()
 
             # Log the request for debugging
             logger.debug(f"{method} {url} - Status: {response.status_code}")
@@ -133,7 +248,9 @@ class RttlApiClient:
                     response.status_code == 200 and cache_key):
                 try:
                     response_data = response.json()
-                    cache.set(cache_key, response_data, self.cache_timeout)
+                    cache.set(cache_key, (time.time(), response_data),
+                              self.cache_timeout + getattr(
+                                  settings, 'RTTL_API_STALE_TIMEOUT', 3600))
                     logger.debug(f"Cached response: {cache_key}")
                 except (ValueError, TypeError):
                     pass  # Skip caching if response isn't JSON
@@ -161,6 +278,44 @@ class RttlApiClient:
                 status_code,
                 response_data)
 
+        finally:
+            if not sent:
+                self._release(pool)
+
+    def _acquire_hedge(self, pool, budget):
+        if self.bulkhead is not None and \
+                not self.bulkhead.try_acquire(pool):
+            return False
+        if self.rate_limiter.acquire(budget, 0):
+            return True
+        self._release(pool)
+        return False
+
+    def _release(self, pool):
+        if self.bulkhead is not None:
+            self.bulkhead.release(pool)
+
+    def warm_up(self, connections: int = 1) -> int:
+        """
+        Open up to `connections` pooled connections to the RTTL API, so the
+        first requests that need them skip the TCP and TLS handshakes.
+        Returns the number opened; nothing is opened when replaying.
+        """
+        if not isinstance(self.transport, SessionTransport):
+            return 0
+
+        def connect(_):
+            try:
+                self.session.head(self._get_url(''), timeout=10)
+                return True
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Error connecting to {self.base_url}: {e}")
+                return False
+
+        # Concurrent requests, as one at a time would reuse one connection
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(connect, range(connections)))
+
     def _handle_response(
             self,
             response: requests.Response) -> Union[Dict, List]:
@@ -186,7 +341,7 @@ class RttlApiClient:
     # Course methods
     def list_courses(
             self,
-            sis_id: str = None,
+            sis_id: Union[str, SisId] = None,
             use_cache: bool = True) -> List[Dict]:
         """
         List courses.
@@ -198,13 +353,14 @@ class RttlApiClient:
         Returns:
             List of course dictionaries
         """
-        params = {'sis_id': sis_id} if sis_id else {}
+        params, cache_key = self._get_sis_id_params(sis_id, 'courses')
 
         response = self._make_request(
             'GET',
             'courses/',
             params=params,
-            use_cache=use_cache)
+            use_cache=use_cache,
+            cache_key=cache_key)
         # return
         # [Course.from_api_data(i) for i in self._handle_response(response)]
         return self._handle_response(response)
@@ -423,7 +579,7 @@ class RttlApiClient:
     # Admin Course methods
     def list_admin_courses(
             self,
-            sis_id: str = None,
+            sis_id: Union[str, SisId] = None,
             use_cache: bool = True) -> List[Dict]:
         """
         List admin courses.
@@ -435,12 +591,13 @@ class RttlApiClient:
         Returns:
             List of admin course dictionaries
         """
-        params = {'sis_id': sis_id} if sis_id else {}
+        params, cache_key = self._get_sis_id_params(sis_id, 'admincourses')
         response = self._make_request(
             'GET',
             'admincourses/',
             params=params,
-            use_cache=use_cache)
+            use_cache=use_cache,
+            cache_key=cache_key)
         return self._handle_response(response)
 
     def get_admin_course(
@@ -463,10 +620,27 @@ class RttlApiClient:
             use_cache=use_cache)
         return self._handle_response(response)
 
+    # Admin Image methods
+    def list_admin_images(self, use_cache: bool = True) -> List[Dict]:
+        """
+        List the container images available for JupyterHubs.
+
+        Args:
+            use_cache: Whether to use cached results
+
+        Returns:
+            List of admin image dictionaries
+        """
+        response = self._make_request(
+            'GET',
+            'adminimages/',
+            use_cache=use_cache)
+        return self._handle_response(response)
+
     # Utility methods
     def get_course_by_sis_id(
             self,
-            sis_course_id: str,
+            sis_course_id: Union[str, SisId],
             use_cache: bool = True) -> Optional[Dict]:
         """
         Get course by SIS ID.
@@ -507,18 +681,47 @@ class RttlApiClient:
         }
 
 
+def _get_session(api_key):
+    """
+    Return this process's requests.Session for an API key, so that clients
+    share its pool of open connections instead of each paying for a new
+    TLS handshake. Keyed by process id, so a forked worker never reuses
+    its parent's connections.
+    """
+    key = (os.getpid(), api_key)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=getattr(
+                settings, 'RTTL_API_POOL_SIZE', 10))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            # Set default headers
+            session.headers.update({
+                'Authorization': f'Bearer Api-Key {api_key}',
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            })
+            _sessions[key] = session
+        return session
+
+
 # Convenience functions for common operations
 def get_rttl_client(
         use_cache: bool = True,
-        cache_timeout: int = 300) -> RttlApiClient:
+        cache_timeout: int = 300,
+        background: bool = False) -> RttlApiClient:
     """
     Get configured RTTL API client instance.
 
     Args:
         use_cache: Whether to enable caching by default
         cache_timeout: Cache timeout in seconds
+        background: Whether reads use the background rate limit budget
     """
-    return RttlApiClient(cache_timeout=cache_timeout if use_cache else 0)
+    return RttlApiClient(cache_timeout=cache_timeout if use_cache else 0,
+                         background=background)
 
 
 def get_course_status_by_sis_id(
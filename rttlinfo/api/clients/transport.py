@@ -0,0 +1,283 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from http.client import responses
+from logging import getLogger
+import requests
+from requests.structures import CaseInsensitiveDict
+from django.conf import settings
+logger = getLogger(__name__)
+
+RECORD = 'record'
+REPLAY = 'replay'
+SCRUBBED_HEADERS = ('authorization', 'proxy-authorization', 'cookie',
+                    'set-cookie', 'x-api-key')
+# Secret fields of JSON request and response bodies, at any depth
+SCRUBBED_FIELDS = ('hub_token', 'api_key', 'token', 'access_token',
+                   'password', 'secret')
+# Fields holding a list of {"key": ..., "value": ...} records, such as a
+# hub's environment variables, whose values may be secrets
+SCRUBBED_VALUE_LISTS = ('extra_envs',)
+SCRUBBED_VALUE = '[scrubbed]'
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_request_key(method, url, params=None, json_data=None, data=None):
+    """
+    Key identifying a request in a cassette: the method, URL, query params
+    and body, independent of dict ordering.
+    """
+    if isinstance(data, bytes):
+        data = data.decode(errors='replace')
+    key_data = json.dumps([method.upper(), url, params or {}, json_data, data],
+                          sort_keys=True, default=str)
+    return hashlib.md5(key_data.encode()).hexdigest()
+
+
+def _scrub(headers):
+    return {name: SCRUBBED_VALUE if name.lower() in SCRUBBED_HEADERS
+            else value for name, value in (headers or {}).items()}
+
+
+def _scrub_json(data):
+    if isinstance(data, dict):
+        return {name: _scrub_field(name.lower(), value)
+                for name, value in data.items()}
+    if isinstance(data, list):
+        return [_scrub_json(value) for value in data]
+    return data
+
+
+def _scrub_field(name, value):
+    if name in SCRUBBED_FIELDS:
+        return SCRUBBED_VALUE
+    if name in SCRUBBED_VALUE_LISTS and isinstance(value, list):
+        # Keep each record's key, so a replayed hub shows which are set
+        return [dict(_scrub_json(record), value=SCRUBBED_VALUE)
+                if isinstance(record, dict) and 'value' in record
+                else SCRUBBED_VALUE for record in value]
+    if name in SCRUBBED_VALUE_LISTS:
+        return SCRUBBED_VALUE
+    return _scrub_json(value)
+
+
+def _scrub_body(content):
+    """
+    A response body as a cassette field: JSON text with secret fields
+    scrubbed, other text as is, or base64 for binary content.
+    """
+    try:
+        text = content.decode()
+    except UnicodeDecodeError:
+        return {'base64': base64.b64encode(content).decode()}
+    try:
+        return {'text': json.dumps(_scrub_json(json.loads(text)))}
+    except ValueError:
+        return {'text': text}
+
+
+class Cassette:
+    """
+    Recorded request/response pairs in a file of one line per request:
+    the request key, a tab, and the JSON record. Replay memory-maps the
+    file and indexes the offsets of each key's records, so only the
+    record being served is parsed.
+
+    A request recorded more than once is replayed in recorded order, and
+    its last response repeats once they have all been served.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = None
+        self._mmap = None
+        self._served = {}
+
+    def append(self, key, record):
+        line = f"{key}\t{json.dumps(record, sort_keys=True)}\n".encode()
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                f.write(line)
+            self._index = None
+
+    def _load(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._index = {}
+        self._served = {}
+        self._mmap = None
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = 0
+        size = len(self._mmap)
+        while start < size:
+            end = self._mmap.find(b'\n', start)
+            if end < 0:
+                end = size
+            tab = self._mmap.find(b'\t', start, end)
+            if tab > start:
+                key = self._mmap[start:tab].decode()
+                self._index.setdefault(key, []).append((tab + 1, end))
+            start = end + 1
+        logger.info(f"Indexed cassette {self.path}: {len(self._index)} "
+                    f"requests")
+
+    def lookup(self, key):
+        """
+        Return the next recorded record for a request key, or None.
+        """
+        with self._lock:
+            if self._index is None:
+                self._load()
+            offsets = self._index.get(key)
+            if not offsets:
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            start, end = offsets[min(served, len(offsets) - 1)]
+            return json.loads(self._mmap[start:end])
+
+    def __len__(self):
+        with self._lock:
+            if self._index is None:
+                self._load()
+            return sum(len(offsets) for offsets in self._index.values())
+
+
+def get_cassette(path):
+    """
+    Return the process-wide Cassette for a path, so clients share its
+    index and replay position.
+    """
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+class SessionTransport:
+    """
+    Sends requests with a requests.Session.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+
+class RecordingTransport(SessionTransport):
+    """
+    Sends requests with a requests.Session and appends each request and
+    its response to a cassette. Authorization and cookie headers, and
+    secret fields such as hub_token in JSON bodies, are scrubbed before
+    anything is written.
+    """
+
+    def __init__(self, session, cassette):
+        super().__init__(session)
+        self.cassette = cassette
+
+    def request(self, method, url, **kwargs):
+        start = time.perf_counter()
+        response = super().request(method, url, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        record = {
+            'request': {
+                'method': method.upper(),
+                'url': url,
+                'params': kwargs.get('params'),
+                'json': _scrub_json(kwargs.get('json')),
+                'headers': _scrub({**self.session.headers,
+                                   **(kwargs.get('headers') or {})}),
+            },
+            'response': {
+                'status_code': response.status_code,
+                'headers': _scrub(response.headers),
+                'elapsed': round(elapsed, 6),
+                **_scrub_body(response.content),
+            },
+        }
+        try:
+            self.cassette.append(get_request_key(
+                method, url, kwargs.get('params'), kwargs.get('json'),
+                kwargs.get('data')), record)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Error recording {method} {url}: {e}")
+        return response
+
+
+class ReplayTransport:
+    """
+    Serves responses from a cassette without any network access. A
+    request that was not recorded raises requests.ConnectionError, so it
+    surfaces as an RttlApiError like an unreachable API would.
+
+    latency is None to respond immediately, 'recorded' to wait as long as
+    the recorded request took, or a number of seconds to wait for every
+    request.
+    """
+
+    def __init__(self, cassette, latency=None):
+        self.cassette = cassette
+        self.latency = latency
+
+    def request(self, method, url, **kwargs):
+        record = self.cassette.lookup(get_request_key(
+            method, url, kwargs.get('params'), kwargs.get('json'),
+            kwargs.get('data')))
+        if record is None:
+            raise requests.exceptions.ConnectionError(
+                f"No recorded response for {method} {url} in "
+                f"{self.cassette.path}")
+
+        recorded = record['response']
+        delay = recorded.get('elapsed', 0) if self.latency == 'recorded' \
+            else self.latency
+        if delay:
+            time.sleep(float(delay))
+
+        response = requests.Response()
+        response.status_code = recorded['status_code']
+        response.reason = responses.get(response.status_code, '')
+        response.headers = CaseInsensitiveDict(recorded.get('headers') or {})
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = base64.b64decode(recorded['base64']) \
+            if 'base64' in recorded else recorded['text'].encode()
+        return response
+
+
+def get_transport(session):
+    """
+    Return the transport for a client's session, as configured by
+    RTTL_API_TRANSPORT: None to send requests normally, 'record' to also
+    write them to the RTTL_API_CASSETTE file, or 'replay' to serve them
+    from it, waiting RTTL_API_REPLAY_LATENCY per request.
+    """
+    mode = getattr(settings, 'RTTL_API_TRANSPORT', None)
+    if mode not in (RECORD, REPLAY):
+        return SessionTransport(session)
+
+    cassette = get_cassette(getattr(
+        settings, 'RTTL_API_CASSETTE', os.path.join(
+            tempfile.gettempdir(), 'rttlinfo_api.cassette')))
+    if mode == RECORD:
+        return RecordingTransport(session, cassette)
+    return ReplayTransport(cassette, getattr(
+        settings, 'RTTL_API_REPLAY_LATENCY', None))
@@ -1,82 +1,102 @@
+from logging import getLogger
+from django.conf import settings
 from django.core.cache import cache
 from rttlinfo.api.clients.rttl_client import RttlApiClient
-import hashlib
-import html
-from urllib.parse import unquote_plus
+from rttlinfo.replica import CONFIGS, DETAILS, STATUS, get_replica
+from rttlinfo.request_cache import memo_get, memo_set
+from rttlinfo.server_timing import timed
+from rttlinfo.sis_id import SisId
+logger = getLogger(__name__)
+
+
+def _cache_get(cache_key):
+    with timed('cache-shared', 'Shared cache'):
+        return cache.get(cache_key)
 
 
 class RttlInfoRepository:
+    """
+    Cached course lookups by SIS ID. Methods accept either a raw SIS ID
+    string or a SisId. Within a request, repeated lookups of the same key
+    are answered from the request-local memo instead of the shared cache.
+
+    With RTTL_REPLICA_MAX_STALENESS set, a shared cache miss is answered
+    from the local replica if it was synced within max_staleness seconds
+    (the setting, unless a lookup passes its own), and from the RTTL API
+    otherwise. Only API responses are written to the shared cache: a pod's
+    replica may predate a change that another pod has already invalidated.
+    """
+    # Seconds that course lookups stay in the shared cache. One hour may be
+    # too long, especially during development.
+    cache_timeout = 30
+
     def __init__(self, api_client=None):
         self.api_client = api_client or RttlApiClient()
+        self.replica = get_replica()
 
-    def _safe_cache_key(self, prefix: str, identifier: str) -> str:
-        """
-        Generate a memcached-safe cache key.
-        Handles special characters in SIS IDs (spaces, ampersands, etc.)
-        """
-        # Use MD5 hash to ensure cache key is safe for memcached
-        hash_key = hashlib.md5(identifier.encode()).hexdigest()
-        return f"{prefix}_{hash_key}"
-
-    def get_course_status(self, course_sis_id):
-        if course_sis_id in [None, '', 'None', 'none']:
-            raise ValueError("Invalid course_sis_id provided.")
-        # First decode URL encoding (handles both %20 and + for spaces)
-        url_decoded_sis_id = unquote_plus(course_sis_id)
-        # Then decode HTML entities (e.g., &amp; -> &)
-        decoded_course_sis_id = html.unescape(url_decoded_sis_id)
-        
-        cache_key = self._safe_cache_key("course_status",
-                                         decoded_course_sis_id)
-        cached = cache.get(cache_key)
-        if cached:
+    def _get_replicated(self, sis_id, kind, max_staleness):
+        if self.replica is None:
+            return None
+        if max_staleness is None:
+            max_staleness = settings.RTTL_REPLICA_MAX_STALENESS
+        try:
+            with timed('replica', 'Local replica'):
+                return self.replica.get(sis_id, kind, max_staleness)
+        except Exception as e:
+            logger.error(f"Error reading replica for {sis_id}: {e}")
+            return None
+
+    def get_course_status(self, course_sis_id, max_staleness=None):
+        sis_id = SisId.parse(course_sis_id)
+
+        cache_key = sis_id.cache_key("course_status")
+        cached = memo_get(cache_key, lambda: _cache_get(cache_key))
+        if cached is not None:
             return cached
 
-        # data = self.api_client.get_course_status(course_sis_id)
-        data = self.api_client.list_courses(decoded_course_sis_id)
-        # cache.set(cache_key, data, timeout=3600)
-        # one hour may be too long, especially during development
-        cache.set(cache_key, data, timeout=30)
+        data = self._get_replicated(sis_id, STATUS, max_staleness)
+        if data is None:
+            # data = self.api_client.get_course_status(course_sis_id)
+            data = self.api_client.list_courses(sis_id)
+            cache.set(cache_key, data, timeout=self.cache_timeout)
+        memo_set(cache_key, data)
         return data
 
-    def get_course_details(self, course_sis_id):
-        if course_sis_id in [None, '', 'None', 'none']:
-            raise ValueError("Invalid course_sis_id provided.")
-        # Apply the same decoding as in get_course_status for consistency
-        url_decoded_sis_id = unquote_plus(course_sis_id)
-        decoded_course_sis_id = html.unescape(url_decoded_sis_id)
-
-        cache_key = self._safe_cache_key("course_details",
-                                         decoded_course_sis_id)
-        cached = cache.get(cache_key)
-        if cached:
+    def get_course_details(self, course_sis_id, max_staleness=None):
+        sis_id = SisId.parse(course_sis_id)
+
+        cache_key = sis_id.cache_key("course_details")
+        cached = memo_get(cache_key, lambda: _cache_get(cache_key))
+        if cached is not None:
             return cached
 
-        # Get course status first to retrieve the course ID
-        status_data = self.get_course_status(course_sis_id)
+        data = self._get_replicated(sis_id, DETAILS, max_staleness)
+        if data is None:
+            # Get course status first to retrieve the course ID
+            status_data = self.get_course_status(sis_id, max_staleness)
 
-        data = self.api_client.get_course(status_data[0]['id'])
-        cache.set(cache_key, data, timeout=30)
+            data = self.api_client.get_course(status_data[0]['id'])
+            cache.set(cache_key, data, timeout=self.cache_timeout)
+        memo_set(cache_key, data)
         return data
 
-    def get_course_configs(self, course_sis_id):
-        if course_sis_id in [None, '', 'None', 'none']:
-            raise ValueError("Invalid course_sis_id provided.")
-        # Apply the same decoding as in get_course_status for consistency
-        url_decoded_sis_id = unquote_plus(course_sis_id)
-        decoded_course_sis_id = html.unescape(url_decoded_sis_id)
-
-        cache_key = self._safe_cache_key("course_configs",
-                                         decoded_course_sis_id)
-        cached = cache.get(cache_key)
-        if cached:
+    def get_course_configs(self, course_sis_id, max_staleness=None):
+        sis_id = SisId.parse(course_sis_id)
+
+        cache_key = sis_id.cache_key("course_configs")
+        cached = memo_get(cache_key, lambda: _cache_get(cache_key))
+        if cached is not None:
             return cached
 
-        # Get course status first to retrieve the course ID
-        status_data = self.get_course_status(course_sis_id)
+        data = self._get_replicated(sis_id, CONFIGS, max_staleness)
+        if data is None:
+            # Get course status first to retrieve the course ID
+            status_data = self.get_course_status(sis_id, max_staleness)
 
-        data = self.api_client.list_course_configs(status_data[0]['id'])
-        cache.set(cache_key, data, timeout=30)
+            data = self.api_client.list_course_configs(
+                status_data[0]['id'])
+            cache.set(cache_key, data, timeout=self.cache_timeout)
+        memo_set(cache_key, data)
         """
         Return data looks something like this:
         [
@@ -95,3 +115,61 @@ class RttlInfoRepository:
         ]
         """
         return data
+
+    def warm_course(self, course_sis_id, timeout=None):
+        """
+        Fetch status, details and configs for a course from the API,
+        bypassing any cached values, and write them to the cache.
+        Returns the cache entries written as a {cache_key: data} dict.
+
+        Details and configs are kept for timeout seconds. Status changes
+        on the RTTL side, so it is kept for the usual cache_timeout unless
+        the RTTL webhook (RTTL_WEBHOOK_SECRET) keeps it current.
+        """
+        sis_id = SisId.parse(course_sis_id)
+        timeout = timeout or self.cache_timeout
+
+        status_data = self.api_client.list_courses(sis_id, use_cache=False)
+        status_entries = {sis_id.cache_key("course_status"): status_data}
+        entries = {}
+        if status_data:
+            course_id = status_data[0]['id']
+            entries[sis_id.cache_key("course_details")] = \
+                self.api_client.get_course(course_id, use_cache=False)
+            entries[sis_id.cache_key("course_configs")] = \
+                self.api_client.list_course_configs(
+                    course_id, use_cache=False)
+
+        if getattr(settings, 'RTTL_WEBHOOK_SECRET', None):
+            entries.update(status_entries)
+        else:
+            cache.set_many(status_entries, timeout=self.cache_timeout)
+        cache.set_many(entries, timeout=timeout)
+        return dict(status_entries, **entries)
+
+    def invalidate_course(self, course_sis_id):
+        """
+        Drop cached status, details and configs for a course, including
+        the client's cached course lookup, after it has changed upstream.
+        """
+        sis_id = SisId.parse(course_sis_id)
+        if self.replica is not None:
+            self.replica.invalidate(sis_id)
+        _, client_key = self.api_client._get_sis_id_params(sis_id, 'courses')
+        cache.delete_many([
+            sis_id.cache_key("course_status"),
+            sis_id.cache_key("course_details"),
+            sis_id.cache_key("course_configs"),
+            client_key,
+        ])
+
+    def replace_course_status(self, course_sis_id, status_data):
+        """
+        Replace a course's cached status with list_courses data pushed from
+        upstream, and drop everything derived from the previous status.
+        """
+        sis_id = SisId.parse(course_sis_id)
+        self.invalidate_course(sis_id)
+        cache_key = sis_id.cache_key("course_status")
+        cache.set(cache_key, status_data, timeout=self.cache_timeout)
+        memo_set(cache_key, status_data)
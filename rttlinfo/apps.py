@@ -2,7 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class RttlInfoConfig(AppConfig):
     name = 'rttlinfo'
+
+    def ready(self):
+        # Opt-in, as ready() also runs for every management command
+        if getattr(settings, 'RTTL_WARM_UP', False):
+            from .warm_up import start_warm_up
+            start_warm_up()
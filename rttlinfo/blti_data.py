@@ -0,0 +1,133 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from logging import getLogger
+from django.conf import settings
+from django.core import signing
+from blti import BLTI, LTI_DATA_KEY
+logger = getLogger(__name__)
+
+SESSION_KEY = 'blti_data'
+COOKIE_NAME = 'rttlinfo_blti'
+
+# Field order of the compact encoding; the role flags are packed into a
+# trailing bitmask
+BLTI_DATA_FIELDS = ('canvas_course_id', 'course_sis_id', 'course_short_name',
+                    'course_long_name', 'user_email', 'user_full_name')
+BLTI_DATA_FLAGS = ('is_instructor', 'is_ta', 'is_student', 'is_admin')
+
+
+def encode_roles(data):
+    """
+    Pack the role flags of a blti_data dict into a bitmask.
+    """
+    flags = 0
+    for bit, name in enumerate(BLTI_DATA_FLAGS):
+        if data.get(name):
+            flags |= 1 << bit
+    return flags
+
+
+def decode_roles(flags):
+    """
+    Unpack the output of encode_roles into a dict of role flags.
+    """
+    return {name: bool(flags & (1 << bit))
+            for bit, name in enumerate(BLTI_DATA_FLAGS)}
+
+
+def encode_blti_data(data):
+    """
+    Encode a blti_data dict as a compact list of field values.
+    """
+    return [data.get(name) for name in BLTI_DATA_FIELDS] + \
+        [encode_roles(data)]
+
+
+def decode_blti_data(encoded):
+    """
+    Decode the output of encode_blti_data back into a blti_data dict.
+    """
+    if isinstance(encoded, dict):
+        # Written before the compact encoding
+        return encoded
+    data = dict(zip(BLTI_DATA_FIELDS, encoded))
+    data['course_name'] = data['course_short_name']
+    data.update(decode_roles(encoded[-1]))
+    return data
+
+
+def _use_cookie():
+    return getattr(settings, 'RTTL_BLTI_DATA_STORAGE', 'session') == 'cookie'
+
+
+def _load_cookie(request):
+    try:
+        return signing.loads(
+            request.COOKIES[COOKIE_NAME], salt=COOKIE_NAME,
+            max_age=settings.SESSION_COOKIE_AGE)
+    except KeyError:
+        return None
+    except signing.BadSignature:
+        logger.warning("Ignoring blti_data cookie with bad signature")
+        return None
+
+
+def get_blti_data(request):
+    """
+    Return the blti_data stored at launch, or an empty dict.
+    """
+    encoded = _load_cookie(request) if _use_cookie() else None
+    if encoded is None:
+        encoded = request.session.get(SESSION_KEY)
+    return decode_blti_data(encoded) if encoded else {}
+
+
+def set_blti_data(request, response, data):
+    """
+    Store blti_data for later requests, writing nothing if it is unchanged.
+
+    With RTTL_BLTI_DATA_STORAGE = 'cookie', the data is carried in a signed
+    cookie instead of the session, unless the signed value is larger than
+    RTTL_BLTI_COOKIE_MAX_SIZE bytes.
+    """
+    encoded = encode_blti_data(data)
+
+    if _use_cookie():
+        if _load_cookie(request) == encoded:
+            value = None
+        else:
+            value = signing.dumps(encoded, salt=COOKIE_NAME, compress=True)
+        if value is None or len(value) <= getattr(
+                settings, 'RTTL_BLTI_COOKIE_MAX_SIZE', 1024):
+            if SESSION_KEY in request.session:
+                del request.session[SESSION_KEY]
+            if value is not None:
+                response.set_cookie(
+                    COOKIE_NAME, value,
+                    max_age=settings.SESSION_COOKIE_AGE,
+                    secure=settings.SESSION_COOKIE_SECURE,
+                    httponly=True,
+                    samesite=settings.SESSION_COOKIE_SAMESITE)
+            return
+        logger.warning(f"blti_data cookie would be {len(value)} bytes, "
+                       f"storing in session instead")
+        if COOKIE_NAME in request.COOKIES:
+            response.delete_cookie(COOKIE_NAME)
+
+    if request.session.get(SESSION_KEY) != encoded:
+        request.session[SESSION_KEY] = encoded
+
+
+def set_launch_session(request, launch_data):
+    """
+    Store LTI launch data in the session the way BLTI().set_session does,
+    but skip the write when a relaunch carries the same data.
+    """
+    launch_data = {key: value for key, value in launch_data.items()
+                   if not key.startswith('oauth_')}
+    if request.session.exists(request.session.session_key) and \
+            request.session.get(LTI_DATA_KEY) == json.dumps(launch_data):
+        return
+    BLTI().set_session(request, **launch_data)
@@ -0,0 +1,262 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+from .api.clients.rttl_client import get_rttl_client
+from .sis_id import TERM_NUMBERS
+logger = getLogger(__name__)
+
+TERMS_CACHE_KEY = 'rttl_capacity_terms'
+SNAPSHOT_CACHE_KEY = 'rttl_capacity_snapshot'
+COLUMNS_TIMEOUT = 60 * 60 * 24
+QUARTERS = {number: quarter for quarter, number in TERM_NUMBERS.items()}
+RESOURCES = ('cpu_request', 'memory_request', 'storage_request')
+PERCENTILES = (50, 90)
+# Distinct features that fit in the 'Q' bitmask column
+FEATURE_BITS = 64
+# Resource column value of a course that does not request the resource;
+# requests are never negative, so these sort ahead of every request
+NOT_REQUESTED = -1.0
+
+
+class TermColumns:
+    """
+    The latest configuration of every course in one term, held as
+    parallel typed arrays with one row per course. Status and image are
+    stored as codes into small lookup lists, features as a bitmask, and
+    resource requests as doubles (NOT_REQUESTED when not requested), so
+    aggregates run over flat arrays instead of per-course objects. Only
+    the first FEATURE_BITS distinct features are counted.
+
+    Rows are keyed by course id and only re-decoded when a course's
+    last_changed has moved, so a refresh is incremental. Each term is
+    cached separately, which keeps every cache item small.
+    """
+
+    def __init__(self, term):
+        self.term = term
+        self.ids = array('q')
+        self.statuses = array('H')
+        self.images = array('H')
+        self.features = array('Q')
+        self.resources = {name: array('d') for name in RESOURCES}
+        self.names = {'statuses': [], 'images': [], 'features': []}
+        self._codes = {kind: {} for kind in self.names}
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _code(self, kind, value):
+        code = self._codes[kind].get(value)
+        if code is None:
+            code = len(self.names[kind])
+            self.names[kind].append(value)
+            self._codes[kind][value] = code
+        return code
+
+    def _columns(self):
+        return [self.ids, self.statuses, self.images, self.features] + \
+            list(self.resources.values())
+
+    def upsert(self, course):
+        """
+        Add or update the row for an RTTL course record. Returns False if
+        the course has not changed since its row was written.
+        """
+        row, last_changed = self._rows.get(course['id'], (None, None))
+        if row is not None and last_changed == course.get('last_changed'):
+            return False
+
+        status = course.get('latest_status') or {}
+        config = status.get('configuration') or {}
+
+        image = config.get('image_uri') or ''
+        if image:
+            image = f"{image.rsplit('/', 1)[-1]}:{config.get('image_tag')}"
+
+        features = 0
+        for feature in (config.get('features_request') or '').split(','):
+            if feature.strip():
+                code = self._code('features', feature.strip().lower())
+                if code < FEATURE_BITS:
+                    features |= 1 << code
+
+        values = [
+            course['id'],
+            self._code('statuses', status.get('status') or 'none'),
+            self._code('images', image),
+            features,
+        ]
+        for name in RESOURCES:
+            value = config.get(name)
+            values.append(float(value) if value is not None
+                          else NOT_REQUESTED)
+
+        if row is None:
+            row = len(self)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+        self._rows[course['id']] = (row, course.get('last_changed'))
+        return True
+
+    def remove(self, course_id):
+        """
+        Remove the row for a course, moving the last row into its place.
+        """
+        row, _ = self._rows.pop(course_id)
+        last = len(self) - 1
+        if row != last:
+            moved = self.ids[last]
+            for column in self._columns():
+                column[row] = column[last]
+            self._rows[moved] = (row, self._rows[moved][1])
+        for column in self._columns():
+            column.pop()
+
+    def prune(self, listed):
+        """
+        Remove the rows of courses whose ids are not in listed. Returns
+        the number removed.
+        """
+        removed = self._rows.keys() - listed
+        for course_id in removed:
+            self.remove(course_id)
+        return len(removed)
+
+    def aggregate(self):
+        """
+        Totals, percentiles, status counts, image counts and feature counts
+        of the term's requested resources.
+        """
+        resources = {}
+        for name, column in self.resources.items():
+            values = sorted(column)
+            values = values[bisect_left(values, 0):]
+            resources[name] = {
+                'requested': len(values),
+                'total': math.fsum(values),
+                'max': values[-1] if values else None,
+            }
+            for percentile in PERCENTILES:
+                resources[name][f'p{percentile}'] = \
+                    _percentile(values, percentile)
+
+        # Few distinct feature combinations, so expand those, not rows
+        features = Counter()
+        for bits, count in Counter(self.features).items():
+            for bit, name in enumerate(self.names['features']):
+                if bits >> bit & 1:
+                    features[name] += count
+
+        return {
+            'term': self.term,
+            'courses': len(self),
+            'resources': resources,
+            'statuses': _count(self.statuses, self.names['statuses']),
+            'images': _count(self.images, self.names['images']),
+            'features': dict(features.most_common()),
+        }
+
+
+def _count(column, names):
+    return {names[code]: count
+            for code, count in Counter(column).most_common() if names[code]}
+
+
+def _percentile(values, percentile):
+    # Nearest-rank percentile of sorted values
+    if not values:
+        return None
+    return values[max(0, math.ceil(percentile / 100 * len(values)) - 1)]
+
+
+def _get_term(course):
+    quarter = course.get('course_quarter')
+    quarter = QUARTERS.get(quarter, str(quarter or '').lower())
+    return f"{quarter} {course.get('course_year') or ''}".strip()
+
+
+def _term_sort_key(term):
+    quarter, _, year = term['term'].partition(' ')
+    return (year, TERM_NUMBERS.get(quarter, 0))
+
+
+def _columns_cache_key(term):
+    return f"rttl_capacity_columns_{hashlib.md5(term.encode()).hexdigest()}"
+
+
+def refresh_columns(client):
+    """
+    Bring the cached TermColumns of every term up to date with the
+    courses listed by the RTTL API, removing courses it no longer lists.
+    Returns ({term: TermColumns}, number of rows that changed).
+    """
+    by_term = defaultdict(list)
+    for course in client.list_courses(use_cache=False):
+        by_term[_get_term(course)].append(course)
+
+    terms = set(cache.get(TERMS_CACHE_KEY) or ()) | set(by_term)
+    keys = {term: _columns_cache_key(term) for term in terms}
+    cached = cache.get_many(list(keys.values()))
+
+    columns = {}
+    changed = 0
+    for term in terms:
+        term_columns = cached.get(keys[term]) or TermColumns(term)
+        listed = by_term.get(term, [])
+        changed += sum(term_columns.upsert(course) for course in listed)
+        changed += term_columns.prune({course['id'] for course in listed})
+        if len(term_columns.names['features']) > FEATURE_BITS:
+            logger.warning(
+                f"{len(term_columns.names['features'])} distinct features "
+                f"requested in {term or 'no term'}; only the first "
+                f"{FEATURE_BITS} are counted")
+        if len(term_columns):
+            columns[term] = term_columns
+
+    cache.set_many({keys[term]: columns[term] for term in columns},
+                   timeout=COLUMNS_TIMEOUT)
+    cache.delete_many([keys[term] for term in terms if term not in columns])
+    cache.set(TERMS_CACHE_KEY, sorted(columns), timeout=COLUMNS_TIMEOUT)
+    return columns, changed
+
+
+def get_capacity_snapshot(client=None):
+    """
+    Return the cached capacity aggregates, refreshing them incrementally
+    once they are older than RTTL_CAPACITY_MAX_AGE seconds.
+    """
+    snapshot = cache.get(SNAPSHOT_CACHE_KEY)
+    if snapshot is not None:
+        return snapshot
+
+    start = time.perf_counter()
+    columns, changed = refresh_columns(client or get_rttl_client(
+        use_cache=False, background=True))
+    courses = sum(len(term_columns) for term_columns in columns.values())
+    snapshot = {
+        'terms': sorted((term_columns.aggregate()
+                         for term_columns in columns.values()),
+                        key=_term_sort_key, reverse=True),
+        'courses': courses,
+        'changed': changed,
+        'refreshed': time.time(),
+    }
+    logger.info(f"Refreshed capacity snapshot: {changed} of {courses} "
+                f"courses changed, {time.perf_counter() - start:.2f}s")
+
+    cache.set(SNAPSHOT_CACHE_KEY, snapshot, timeout=getattr(
+        settings, 'RTTL_CAPACITY_MAX_AGE', 300))
+    return snapshot
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from django.core.validators import EmailValidator
 from django.core.exceptions import ValidationError
@@ -373,6 +373,42 @@ class CourseConfiguration:
             'configuration_comments': self.configuration_comments
         }
 
+    def diff(self, other: 'CourseConfiguration') -> Dict[str, Tuple]:
+        """
+        Compare image, resources, features and gitpuller targets with
+        another configuration. Returns {field: (other value, this value)}
+        for each field that differs; empty if they are equivalent.
+        Comments, timestamps and the applied flag are ignored.
+        """
+        changes = {}
+        for name in ('image_uri', 'image_tag', 'cpu_request',
+                     'memory_request', 'storage_request'):
+            old, new = getattr(other, name), getattr(self, name)
+            if str(old or '') != str(new or ''):
+                changes[name] = (old, new)
+
+        old, new = other._features_key(), self._features_key()
+        if old != new:
+            changes['features_request'] = (', '.join(old), ', '.join(new))
+
+        old, new = other._targets_key(), self._targets_key()
+        if old != new:
+            changes['gitpuller_targets'] = (
+                ', '.join(f"{uri}@{tag} -> {sync_dir}"
+                          for uri, tag, sync_dir in old),
+                ', '.join(f"{uri}@{tag} -> {sync_dir}"
+                          for uri, tag, sync_dir in new))
+        return changes
+
+    def _features_key(self) -> List[str]:
+        return sorted({feature.lower() for feature in
+                       self.get_features_list()})
+
+    def _targets_key(self) -> List[Tuple[str, str, str]]:
+        return [(target.gitpuller_uri, target.gitpuller_tag,
+                 target.gitpuller_sync_dir)
+                for target in self.gitpuller_targets]
+
 
 @dataclass
 class CourseStatus:
@@ -686,6 +722,15 @@ class CourseStatusUpdate:
 
 
 # Utility functions
+def format_configuration_diff(changes: Dict[str, Tuple]) -> str:
+    """
+    Describe the output of CourseConfiguration.diff() for operators, e.g.
+    "cpu_request: 2 -> 4; image_tag: 2.7.0 -> 2.7.1".
+    """
+    return '; '.join(f"{name}: {old or '(none)'} -> {new or '(none)'}"
+                     for name, (old, new) in changes.items())
+
+
 def parse_api_datetime(dt_str: Optional[str]) -> Optional[datetime]:
     """
     Parse datetime string from API response.
@@ -1,6 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from .dataclasses import CourseConfiguration, GitpullerTarget
+from .image_catalog import get_image_catalog, get_image_choices
 
 
 class GitpullerTargetForm(forms.Form):
@@ -87,27 +88,7 @@ class CourseConfigurationForm(forms.Form):
         label='Container Image',
         help_text='Select the image to be used for your course',
         required=False,
-        choices=[
-            ('scipy', 'SciPy - Scientific computing with Python [<a href='
-             '"https://github.com/uw-it-aca/rttl-notebooks/tree/main/scipy" '
-             'target="_blank">Image details</a>]'),
-            ('datascience', 'Datascience - Data analysis and visualization [<a href='
-             '"https://github.com/uw-it-aca/rttl-notebooks/tree/main/datascience" '
-             'target="_blank">Image details</a>]'),
-            ('tensorflow', 'TensorFlow - Machine learning and deep learning [<a href='
-             '"https://github.com/uw-it-aca/rttl-notebooks/tree/main/tensorflow" '
-             'target="_blank">Image details</a>]'),
-            ('r', 'R - Statistical computing and graphics [<a href='
-             '"https://github.com/uw-it-aca/rttl-notebooks/tree/main/r" '
-             'target="_blank">Image details</a>]'),
-            ('rstudio', 'RStudio Server (Open Source Edition) [<a href='
-             '"https://github.com/uw-it-aca/rttl-notebooks/tree/main/rstudio" '
-             'target="_blank">Image details</a>]'),
-            ('rstudio-ai', 'RStudio Server with AI integrations enabled [<a href='
-             '"https://github.com/uw-it-aca/rttl-notebooks/tree/main/ai" '
-             'target="_blank">Image details</a>]'),
-            ('custom', 'Custom image (instructor supported)'),
-        ],
+        choices=get_image_choices,
         initial='scipy',
         widget=forms.RadioSelect(attrs={
             'class': 'form-check-input'
@@ -300,16 +281,9 @@ class CourseConfigurationForm(forms.Form):
             image_uri = data.get('custom_image_url')
             image_tag = data.get('custom_image_tag')
         else:
-            # Map container image choices to actual image URIs
-            image_mapping = {
-                'scipy': ('us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-scipy-notebook', '2.7.1'),
-                'datascience': ('us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-datascience-notebook', '2.7.1'),
-                'tensorflow': ('us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-tensorflow-notebook', '2.7.1'),
-                'r': ('us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-r-notebook', '2.7.1'),
-                'rstudio': ('us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-rstudio-notebook', '2.7.1'),
-                'rstudio-ai': ('us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-ai-notebook', '2.7.0'),
-            }
-            image_uri, image_tag = image_mapping.get(container_choice, image_mapping['scipy'])
+            catalog = get_image_catalog()
+            image_uri, image_tag = catalog.get_image(container_choice) or \
+                catalog.get_image(catalog.default_choice)
 
         # Get features from checkboxes
         features_list = self.get_features_list()
@@ -331,17 +305,9 @@ class CourseConfigurationForm(forms.Form):
         """
         Populate form fields from CourseConfiguration dataclass.
         """
-        # Map image URIs back to container choices
-        image_reverse_mapping = {
-            'us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-scipy-notebook': 'scipy',
-            'us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-datascience-notebook': 'datascience',
-            'us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-tensorflow-notebook': 'tensorflow',
-            'us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-r-notebook': 'r',
-            'us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-rstudio-notebook': 'rstudio',
-            'us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images/jupyter-ai-notebook': 'rstudio-ai',
-        }
-
-        container_choice = image_reverse_mapping.get(config.image_uri, 'custom')
+        # Map the image back to a container choice
+        container_choice = get_image_catalog().get_choice(
+            config.image_uri, config.image_tag)
 
         # Parse features string to set checkboxes
         features_list = [f.strip().lower() for f in config.features_request.split(',') if f.strip()] if config.features_request else []
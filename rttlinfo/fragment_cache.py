@@ -0,0 +1,33 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from django.conf import settings
+from .image_catalog import get_image_catalog
+
+with open(os.path.join(os.path.dirname(__file__), 'VERSION')) as f:
+    VERSION = f.read().strip()
+
+
+def get_role(blti_data):
+    """
+    The most privileged LTI role in blti_data, as a fragment cache key.
+    """
+    for role in ('admin', 'instructor', 'ta', 'student'):
+        if blti_data.get(f'is_{role}'):
+            return role
+    return 'none'
+
+
+def get_fragment_cache_context(blti_data):
+    """
+    Template context for the {% cache %} fragments of the static parts of
+    the request page. The form version changes with each app release and
+    whenever the image catalog does.
+    """
+    return {
+        'fragment_cache_timeout': getattr(
+            settings, 'RTTL_FRAGMENT_CACHE_TIMEOUT', 60 * 60),
+        'form_version': f"{VERSION}-{get_image_catalog().version}",
+        'role': get_role(blti_data),
+    }
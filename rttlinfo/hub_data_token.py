@@ -0,0 +1,30 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.conf import settings
+from django.core import signing
+
+TOKEN_SALT = 'rttlinfo.hub_data_token'
+TOKEN_HEADER = 'HTTP_X_RTTL_TOKEN'
+
+
+def make_hub_data_token(blti_data):
+    """
+    Mint a signed token binding the launch's course SIS ID, so the hub
+    data endpoint can authorize a request without the session. Like the
+    session-authorized endpoint, it serves any role launched into the
+    course, so no roles are bound.
+    """
+    return signing.dumps(str(blti_data.get('course_sis_id') or ''),
+                         salt=TOKEN_SALT)
+
+
+def read_hub_data_token(token):
+    """
+    Return the course SIS ID from a token minted by make_hub_data_token.
+    Raises signing.BadSignature if the token is invalid or older than
+    RTTL_HUB_DATA_TOKEN_MAX_AGE seconds.
+    """
+    return signing.loads(
+        token, salt=TOKEN_SALT,
+        max_age=getattr(settings, 'RTTL_HUB_DATA_TOKEN_MAX_AGE', 60 * 15))
@@ -0,0 +1,101 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import threading
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+from .sis_id import SisId
+logger = getLogger(__name__)
+
+_PENDING = 'pending'
+_DONE = 'done'
+
+
+class SubmissionInProgress(Exception):
+    """
+    An identical submission is still being sent upstream by another
+    request.
+    """
+    pass
+
+
+def get_idempotency_key(status_update, submitter=None):
+    """
+    Cache key identifying a CourseStatusUpdate by course, status, message,
+    hub admins and normalized configuration. Who submitted it does not
+    contribute: the submitter's netid is left out of the hub admins, so
+    the same request made by two instructors shares a key, as does one
+    repeated by double clicks or retries.
+    """
+    config = {}
+    if status_update.configuration:
+        config = status_update.configuration.to_api_data()
+        config['features_request'] = sorted(
+            status_update.configuration.get_features_list())
+        config['configuration_comments'] = ' '.join(
+            (config['configuration_comments'] or '').split())
+
+    submitter = (submitter or '').strip().lower()
+    hub_admins = sorted({admin.strip().lower()
+                         for admin in status_update.hub_admins or ()
+                         if admin.strip()} - {submitter})
+
+    payload = json.dumps(
+        [str(SisId.parse(status_update.sis_course_id)),
+         status_update.status, ' '.join((status_update.message or '').split()),
+         hub_admins, config],
+        sort_keys=True)
+    return f"hub_submission_{hashlib.md5(payload.encode()).hexdigest()}"
+
+
+def submit_once(key, submit):
+    """
+    Call submit() unless an identical submission holds the lease for key.
+
+    The first caller takes a cache lease with cache.add(), renews it every
+    third of RTTL_SUBMISSION_LEASE_TIMEOUT while submit() runs, and stores
+    its result for RTTL_SUBMISSION_RESULT_TIMEOUT seconds. If submit()
+    raises, the lease is released so a retry can go through.
+
+    Returns (result, duplicate), where duplicate means the result is that
+    of an earlier identical submission. Raises SubmissionInProgress at
+    once, rather than holding the request, if one is still running.
+    """
+    lease_timeout = getattr(settings, 'RTTL_SUBMISSION_LEASE_TIMEOUT', 30)
+
+    # A second try covers a lease released between the add and the get
+    for _ in range(2):
+        if cache.add(key, (_PENDING, None), timeout=lease_timeout):
+            break
+        entry = cache.get(key)
+        if entry is not None:
+            if entry[0] != _DONE:
+                raise SubmissionInProgress(key)
+            logger.info(f"Collapsed duplicate submission {key}")
+            return entry[1], True
+    else:
+        raise SubmissionInProgress(key)
+
+    done = threading.Event()
+
+    def renew():
+        while not done.wait(lease_timeout / 3):
+            cache.touch(key, lease_timeout)
+
+    renewer = threading.Thread(target=renew, daemon=True,
+                               name="hub-submission-lease")
+    renewer.start()
+    try:
+        result = submit()
+    except Exception:
+        cache.delete(key)
+        raise
+    finally:
+        done.set()
+        renewer.join()
+    cache.set(key, (_DONE, result), timeout=getattr(
+        settings, 'RTTL_SUBMISSION_RESULT_TIMEOUT', 300))
+    return result, False
@@ -0,0 +1,198 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import threading
+import time
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.html import escape
+from django.utils.text import slugify
+from .api.clients.rttl_client import get_rttl_client
+from .dataclasses import AdminImage
+logger = getLogger(__name__)
+
+CACHE_KEY = 'rttl_image_catalog'
+CUSTOM_CHOICE = 'custom'
+IMAGE_REGISTRY = 'us-west1-docker.pkg.dev/uwit-mci-axdd/rttl-images'
+IMAGE_DETAILS_URL = 'https://github.com/uw-it-aca/rttl-notebooks/tree/main'
+
+# (choice, repo, tag, label) for the images offered until the catalog has
+# been loaded from the RTTL API. Images from the API with one of these
+# repos keep its choice and label.
+DEFAULT_IMAGES = [
+    ('scipy', f'{IMAGE_REGISTRY}/jupyter-scipy-notebook', '2.7.1',
+     'SciPy - Scientific computing with Python [<a href='
+     f'"{IMAGE_DETAILS_URL}/scipy" target="_blank">Image details</a>]'),
+    ('datascience', f'{IMAGE_REGISTRY}/jupyter-datascience-notebook', '2.7.1',
+     'Datascience - Data analysis and visualization [<a href='
+     f'"{IMAGE_DETAILS_URL}/datascience" target="_blank">Image details</a>]'),
+    ('tensorflow', f'{IMAGE_REGISTRY}/jupyter-tensorflow-notebook', '2.7.1',
+     'TensorFlow - Machine learning and deep learning [<a href='
+     f'"{IMAGE_DETAILS_URL}/tensorflow" target="_blank">Image details</a>]'),
+    ('r', f'{IMAGE_REGISTRY}/jupyter-r-notebook', '2.7.1',
+     'R - Statistical computing and graphics [<a href='
+     f'"{IMAGE_DETAILS_URL}/r" target="_blank">Image details</a>]'),
+    ('rstudio', f'{IMAGE_REGISTRY}/jupyter-rstudio-notebook', '2.7.1',
+     'RStudio Server (Open Source Edition) [<a href='
+     f'"{IMAGE_DETAILS_URL}/rstudio" target="_blank">Image details</a>]'),
+    ('rstudio-ai', f'{IMAGE_REGISTRY}/jupyter-ai-notebook', '2.7.0',
+     'RStudio Server with AI integrations enabled [<a href='
+     f'"{IMAGE_DETAILS_URL}/ai" target="_blank">Image details</a>]'),
+]
+
+_catalog = None
+_refresh_thread = None
+_last_attempt = 0
+_lock = threading.Lock()
+
+
+class ImageCatalog:
+    """
+    The container images offered on the configuration form, indexed by
+    form choice and by image. Instances are not modified once built; a
+    refresh replaces the whole catalog.
+    """
+    custom_label = 'Custom image (instructor supported)'
+
+    def __init__(self, images, loaded=0):
+        self.images = images
+        self.loaded = loaded
+        self.choices = []
+        self._by_choice = {}
+        self._by_image = {}
+        self._by_repo = {}
+        # Later entries for a choice win, so the API's newest tag of a
+        # repo is the one offered, while older tags still map back to it
+        for choice, repo, tag, label in images:
+            if choice not in self._by_choice:
+                self.choices.append((choice, label))
+            self._by_choice[choice] = (repo, tag)
+            self._by_image[(repo, tag)] = choice
+            self._by_repo[repo] = choice
+        self.choices.append((CUSTOM_CHOICE, self.custom_label))
+        self.version = hashlib.md5(
+            repr((self.choices, images)).encode()).hexdigest()[:12]
+
+    @classmethod
+    def from_api_data(cls, data, loaded):
+        """
+        Build a catalog from a list of AdminImage API records.
+
+        Tags of one repo share a choice. An image whose name slugifies to
+        the choice of another repo gets its id appended instead, so that
+        neither replaces the other.
+        """
+        defaults = {repo: (choice, label)
+                    for choice, repo, _, label in DEFAULT_IMAGES}
+        repos = {choice: repo for choice, repo, _, _ in DEFAULT_IMAGES}
+        choices = {}
+        images = []
+        for image in sorted((AdminImage.from_api_data(record)
+                             for record in data), key=lambda i: i.id):
+            choice, label = defaults.get(image.repo, (None, None))
+            if choice is None:
+                choice = choices.get(image.repo) or \
+                    slugify(image.name) or str(image.id)
+                if repos.get(choice, image.repo) != image.repo:
+                    logger.warning(
+                        f"Image {image.id} ({image.repo}) has the same "
+                        f"choice '{choice}' as {repos[choice]}; offering it "
+                        f"as '{choice}-{image.id}'")
+                    choice = f"{choice}-{image.id}"
+                label = escape(f"{image.name} - {image.description}"
+                               if image.description else image.name)
+            repos.setdefault(choice, image.repo)
+            choices.setdefault(image.repo, choice)
+            images.append((choice, image.repo, image.tag, label))
+        return cls(images, loaded)
+
+    @property
+    def default_choice(self):
+        return self.choices[0][0]
+
+    def get_image(self, choice):
+        """
+        Return the (repo, tag) for a form choice, or None.
+        """
+        return self._by_choice.get(choice)
+
+    def get_choice(self, repo, tag=None):
+        """
+        Return the form choice for an image, or 'custom' if the repo is
+        not in the catalog.
+        """
+        return self._by_image.get((repo, tag)) or \
+            self._by_repo.get(repo, CUSTOM_CHOICE)
+
+
+def get_image_catalog():
+    """
+    Return the current ImageCatalog without waiting on the RTTL API. The
+    built-in DEFAULT_IMAGES are used until the first load completes, and
+    a background refresh starts once the catalog is older than
+    RTTL_IMAGE_CATALOG_MAX_AGE seconds.
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = ImageCatalog(DEFAULT_IMAGES)
+    if time.time() - _catalog.loaded > _get_max_age():
+        refresh_image_catalog()
+    return _catalog
+
+
+def get_image_choices():
+    """
+    Choices for the container image field; callable so that a form sees
+    the current catalog.
+    """
+    return get_image_catalog().choices
+
+
+def refresh_image_catalog(wait=False, retry_interval=300):
+    """
+    Start a background reload of the catalog unless one is running or the
+    last attempt was within retry_interval seconds. With wait, block until
+    it has finished.
+    """
+    global _refresh_thread, _last_attempt
+    with _lock:
+        thread = _refresh_thread
+        if thread is None or not thread.is_alive():
+            if time.time() - _last_attempt < retry_interval:
+                return
+            _last_attempt = time.time()
+            thread = threading.Thread(
+                target=_refresh, daemon=True, name="image-catalog-refresh")
+            _refresh_thread = thread
+            thread.start()
+    if wait:
+        thread.join()
+
+
+def _refresh():
+    global _catalog
+    max_age = _get_max_age()
+    try:
+        # Share one API lookup between workers through the cache
+        cached = cache.get(CACHE_KEY)
+        if cached is None:
+            data = get_rttl_client(
+                use_cache=False, background=True).list_admin_images()
+            cached = (time.time(), data)
+            cache.set(CACHE_KEY, cached, timeout=max_age)
+        catalog = ImageCatalog.from_api_data(cached[1], loaded=cached[0])
+    except Exception as e:
+        logger.error(f"Error loading image catalog: {e}")
+        return
+
+    if not catalog.images:
+        logger.warning("RTTL API returned no images, keeping image catalog")
+        return
+    _catalog = catalog
+    logger.info(f"Loaded image catalog: {len(catalog.images)} images")
+
+
+def _get_max_age():
+    return getattr(settings, 'RTTL_IMAGE_CATALOG_MAX_AGE', 60 * 60)
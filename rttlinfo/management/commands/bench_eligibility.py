@@ -0,0 +1,60 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+import timeit
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from rttlinfo.utils import (
+    get_course_eligibility, get_course_eligibility_bulk)
+
+
+class Command(BaseCommand):
+    help = ("Benchmark get_course_eligibility_bulk against calling "
+            "get_course_eligibility once per SIS ID.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count', type=int, default=5000,
+            help='Number of synthetic SIS IDs (default 5000)')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Timing repetitions; the best is reported (default 5)')
+
+    def handle(self, *args, **options):
+        sis_ids = self.get_sis_ids(options['count'])
+
+        expected = [get_course_eligibility(sis_id) for sis_id in sis_ids]
+        bulk = get_course_eligibility_bulk(sis_ids)
+        if expected != [bulk[sis_id] is None for sis_id in sis_ids]:
+            self.stderr.write("Bulk results differ from the per-ID loop")
+            return
+
+        loop_time = min(timeit.repeat(
+            lambda: [get_course_eligibility(sis_id) for sis_id in sis_ids],
+            number=1, repeat=options['repeat']))
+        bulk_time = min(timeit.repeat(
+            lambda: get_course_eligibility_bulk(sis_ids),
+            number=1, repeat=options['repeat']))
+
+        self.stdout.write(
+            f"{len(sis_ids)} SIS IDs, {sum(expected)} eligible\n"
+            f"per-ID loop: {loop_time * 1000:.1f} ms\n"
+            f"bulk:        {bulk_time * 1000:.1f} ms "
+            f"({loop_time / bulk_time:.1f}x)")
+
+    def get_sis_ids(self, count):
+        rand = random.Random(count)
+        year = datetime.now().year
+        sis_ids = []
+        for i in range(count):
+            if i % 20 == 0:
+                sis_ids.append(f"not-a-sis-id-{i}")
+                continue
+            sis_ids.append("{}-{}-{}-{}-{}".format(
+                rand.randint(year - 2, year + 1),
+                rand.choice(['winter', 'spring', 'summer', 'autumn']),
+                rand.choice(['CSE', 'MATH', 'B E', 'E E', 'A&A S']),
+                rand.randint(100, 599),
+                rand.choice(['A', 'AB', 'B'])))
+        return sis_ids
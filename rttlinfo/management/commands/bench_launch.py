@@ -0,0 +1,87 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import time
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from blti import LTI_DATA_KEY
+from rttlinfo.blti_data import set_blti_data, set_launch_session
+
+LAUNCH_DATA = {
+    'context_id': 'b3a1c2d4e5f6', 'context_label': 'PSYCH 102 A',
+    'context_title': 'PSYCH 102 A Au 25: Introduction To Psychology II',
+    'custom_canvas_course_id': '1234567',
+    'lis_course_offering_sourcedid': '2025-autumn-PSYCH-102-A',
+    'lis_person_contact_email_primary': 'instructor@uw.edu',
+    'lis_person_name_full': 'Ima Instructor',
+    'roles': 'Instructor', 'oauth_nonce': '', 'oauth_timestamp': '',
+}
+BLTI_DATA = {
+    'canvas_course_id': '1234567',
+    'course_sis_id': '2025-autumn-PSYCH-102-A',
+    'course_name': 'PSYCH 102 A',
+    'course_short_name': 'PSYCH 102 A',
+    'course_long_name': 'PSYCH 102 A Au 25: Introduction To Psychology II',
+    'is_instructor': True, 'is_ta': False, 'is_student': False,
+    'is_admin': False, 'user_email': 'instructor@uw.edu',
+    'user_full_name': 'Ima Instructor',
+}
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the session and cookie handling of repeated LTI "
+            "launches by one user in one course. LTI signature validation "
+            "and template rendering are not included.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--launches', type=int, default=2000,
+            help='Number of launches per mode (default 2000)')
+
+    def handle(self, *args, **options):
+        for mode in ('legacy', 'session', 'cookie'):
+            with override_settings(RTTL_BLTI_DATA_STORAGE=mode):
+                self.run_mode(mode, options['launches'])
+
+    def run_mode(self, mode, launches):
+        saves = [0]
+
+        def launch(request):
+            response = HttpResponse()
+            if mode == 'legacy':
+                launch_data = {k: v for k, v in LAUNCH_DATA.items()
+                               if not k.startswith('oauth_')}
+                if not request.session.exists(request.session.session_key):
+                    request.session.create()
+                request.session[LTI_DATA_KEY] = json.dumps(launch_data)
+                request.session['blti_data'] = dict(BLTI_DATA)
+            else:
+                set_launch_session(request, LAUNCH_DATA)
+                set_blti_data(request, response, BLTI_DATA)
+            saves[0] += request.session.modified
+            return response
+
+        middleware = SessionMiddleware(launch)
+        factory = RequestFactory()
+        cookies = {}
+        size = 0
+
+        start = time.perf_counter()
+        for _ in range(launches):
+            request = factory.post('/')
+            request.COOKIES.update(cookies)
+            response = middleware(request)
+            for key, morsel in response.cookies.items():
+                if morsel.value:
+                    cookies[key] = morsel.value
+                else:
+                    cookies.pop(key, None)
+            size = sum(len(k) + len(v) for k, v in cookies.items())
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{mode:8} {launches / elapsed:8.0f} launches/s, "
+            f"{saves[0]} session writes, {size} cookie bytes")
@@ -0,0 +1,85 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+from django.core.management.base import BaseCommand
+from rttlinfo.management.commands.bench_launch import BLTI_DATA
+
+# Run in a fresh interpreter, so every import is paid again
+WORKER = """
+import json, os, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from importlib import import_module
+from django.conf import settings
+import_module(settings.ROOT_URLCONF)
+result = {'import': time.perf_counter() - start,
+          'uw_sws_imported': 'uw_sws' in sys.modules}
+
+if os.environ['RTTL_BENCH_WARM'] == '1':
+    from rttlinfo.warm_up import warm_up
+    start = time.perf_counter()
+    warm_up()
+    result['warm_up'] = time.perf_counter() - start
+
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from rttlinfo.hub_data_token import make_hub_data_token
+setup_test_environment()
+sis_id = os.environ['RTTL_BENCH_SIS_ID']
+client = Client(HTTP_X_RTTL_TOKEN=make_hub_data_token(
+    {'course_sis_id': sis_id, 'is_instructor': True}))
+for name in ('first', 'second'):
+    start = time.perf_counter()
+    response = client.get(reverse('hub-data-token-api'),
+                          {'course_sis_id': sis_id})
+    result[name] = time.perf_counter() - start
+    result[name + '_status'] = response.status_code
+print(json.dumps(result))
+"""
+
+
+class Command(BaseCommand):
+    help = ("Benchmark worker startup: importing the app and URLconf in a "
+            "fresh interpreter, then its first and second hub data "
+            "requests, with and without warm_up() beforehand. Requests go "
+            "to the configured RTTL API; set RTTL_API_TRANSPORT = 'replay' "
+            "to run offline.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs', type=int, default=5,
+            help='Fresh interpreters per mode (default 5)')
+        parser.add_argument(
+            '--sis-id', default=BLTI_DATA['course_sis_id'],
+            help='Course SIS ID requested')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path),
+                   RTTL_BENCH_SIS_ID=options['sis_id'])
+        for mode, warm in (('cold', '0'), ('warm', '1')):
+            results = []
+            for _ in range(options['runs']):
+                output = subprocess.run(
+                    [sys.executable, '-c', WORKER],
+                    env=dict(env, RTTL_BENCH_WARM=warm),
+                    capture_output=True, text=True, check=True).stdout
+                results.append(json.loads(output.splitlines()[-1]))
+
+            def ms(name):
+                return f"{median(r[name] for r in results) * 1000:7.1f} ms"
+
+            line = (f"{mode}: import {ms('import')}, "
+                    f"first request {ms('first')}, "
+                    f"second request {ms('second')}")
+            if warm == '1':
+                line += f", warm-up {ms('warm_up')}"
+            self.stdout.write(
+                f"{line} (status {results[0]['first_status']}, uw_sws "
+                f"imported at startup: {results[0]['uw_sws_imported']})")
@@ -0,0 +1,52 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from rttlinfo.forms import CourseConfigurationForm
+from rttlinfo.fragment_cache import get_fragment_cache_context
+from rttlinfo.management.commands.bench_launch import BLTI_DATA
+
+TEMPLATES = ('rttlinfo/request.html',)
+
+
+class Command(BaseCommand):
+    help = ("Benchmark rendering the request page with its static "
+            "fragments re-rendered on every request and served from the "
+            "fragment cache.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--renders', type=int, default=500,
+            help='Number of renders per template and mode (default 500)')
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        for template_name in TEMPLATES:
+            for mode in ('uncached', 'cached'):
+                def render():
+                    context = get_fragment_cache_context(BLTI_DATA)
+                    context.update({
+                        'blti_data': BLTI_DATA,
+                        'form': CourseConfigurationForm(),
+                    })
+                    if mode == 'uncached':
+                        # Expires immediately, so every render misses
+                        context['fragment_cache_timeout'] = 0
+                    return render_to_string(
+                        template_name, context, request=factory.get('/'))
+
+                cache.clear()
+                size = len(render())
+                start = time.perf_counter()
+                for _ in range(options['renders']):
+                    render()
+                elapsed = time.perf_counter() - start
+
+                self.stdout.write(
+                    f"{template_name:24} {mode:8} "
+                    f"{elapsed * 1000 / options['renders']:6.2f} ms/render, "
+                    f"{size} bytes")
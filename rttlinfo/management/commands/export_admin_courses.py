@@ -0,0 +1,54 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from rttlinfo.admin_export import export_admin_courses
+from rttlinfo.api.clients.rttl_client import get_rttl_client
+
+
+class Command(BaseCommand):
+    help = ("Export every admin course with its hub settings as NDJSON or "
+            "CSV, writing rows as their details arrive.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=('ndjson', 'csv'), default='ndjson',
+            help='Output format (default ndjson)')
+        parser.add_argument(
+            '--output', default='-',
+            help='File to write (default: standard output)')
+        parser.add_argument(
+            '--gzip', action='store_true',
+            help='Gzip the output')
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Maximum number of course details fetched at once '
+                 '(default 4)')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be positive')
+
+        chunks = export_admin_courses(
+            get_rttl_client(use_cache=False, background=True),
+            options['format'], options['concurrency'])
+
+        if options['output'] == '-':
+            out = gzip.open(sys.stdout.buffer, 'wt') if options['gzip'] \
+                else sys.stdout
+        elif options['gzip']:
+            out = gzip.open(options['output'], 'wt', newline='')
+        else:
+            out = open(options['output'], 'w', newline='')
+
+        rows = -1 if options['format'] == 'csv' else 0
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                rows += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        self.stderr.write(f"Exported {rows} admin courses")
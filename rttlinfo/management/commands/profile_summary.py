@@ -0,0 +1,52 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from django.core.management.base import BaseCommand
+from rttlinfo.profiling import get_profile_store, make_profile_token
+
+
+class Command(BaseCommand):
+    help = ("Summarize the top cumulative hot spots per view from the "
+            "profiles saved by ProfilingMiddleware, or print a token for "
+            "the X-Rttl-Profile header.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=15,
+            help='Hot spots listed per view (default 15)')
+        parser.add_argument(
+            '--view', help='Only summarize this view name')
+        parser.add_argument(
+            '--json', action='store_true', help='Output JSON')
+        parser.add_argument(
+            '--token', action='store_true',
+            help='Print an X-Rttl-Profile header value and exit')
+
+    def handle(self, *args, **options):
+        if options['token']:
+            self.stdout.write(make_profile_token())
+            return
+
+        store = get_profile_store()
+        summary = store.summary(limit=options['limit'])
+        if options['view']:
+            summary = {name: view for name, view in summary.items()
+                       if name == options['view']}
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        if not summary:
+            self.stdout.write(f"No profiles in {store.path}")
+        for view_name, view in summary.items():
+            self.stdout.write(
+                f"\n{view_name}: {view['requests']} requests, "
+                f"{view['mean_ms']:.1f} ms mean")
+            self.stdout.write(
+                f"  {'cum ms':>9} {'own ms':>9} {'calls':>9}  function")
+            for spot in view['hot_spots']:
+                self.stdout.write(
+                    f"  {spot['cumulative_ms']:9.2f} {spot['own_ms']:9.2f} "
+                    f"{spot['calls']:9.1f}  {spot['function']}")
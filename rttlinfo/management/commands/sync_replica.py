@@ -0,0 +1,48 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from logging import getLogger
+from django.core.management.base import BaseCommand, CommandError
+from rttlinfo.api.clients.rttl_client import get_rttl_client
+from rttlinfo.replica import Replica, get_replica_path
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = ("Sync the local replica of RTTL courses, latest statuses, "
+            "details and configs, fetching only courses changed since "
+            "they were last replicated.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep syncing every this many seconds (default: once)')
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Changed courses fetched at once (default 4)')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['interval'] < 0:
+            raise CommandError('--concurrency must be positive and '
+                               '--interval not negative')
+
+        replica = Replica(get_replica_path())
+        client = get_rttl_client(use_cache=False, background=True)
+        while True:
+            start = time.monotonic()
+            try:
+                changed = replica.sync(client, options['concurrency'])
+                self.stdout.write(
+                    f"Synced {replica.path}: {changed} courses changed in "
+                    f"{time.monotonic() - start:.1f}s")
+            except Exception as e:
+                if not options['interval']:
+                    raise
+                logger.error(f"Error syncing replica {replica.path}: {e}")
+
+            if not options['interval']:
+                return
+            time.sleep(max(0, options['interval'] -
+                           (time.monotonic() - start)))
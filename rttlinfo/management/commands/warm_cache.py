@@ -0,0 +1,119 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging import getLogger
+from django.core.management.base import BaseCommand, CommandError
+from rttlinfo.api.clients.rttl_client import get_rttl_client
+from rttlinfo.api.repositories.rttl_repository import RttlInfoRepository
+from rttlinfo.term_calendar import get_term_calendar
+from rttlinfo.utils import (
+    get_next_term, get_term_from_string, validate_source_sis)
+logger = getLogger(__name__)
+
+# Long enough for details and configs warmed the evening before a quarter
+# starts to last through its first day. Course status only gets this
+# timeout when the RTTL webhook keeps it current.
+DEFAULT_TIMEOUT = 12 * 60 * 60
+
+
+class Command(BaseCommand):
+    help = ("Pre-populate the course status, details and configs cache "
+            "for the current and next term's courses.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sis-file',
+            help='File of SIS IDs to warm, one per line, instead of '
+                 'enumerating the current and next term')
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Maximum number of courses fetched at once (default 4)')
+        parser.add_argument(
+            '--rate', type=float, default=10.0,
+            help='Maximum number of courses started per second (default 10)')
+        parser.add_argument(
+            '--timeout', type=int, default=DEFAULT_TIMEOUT,
+            help='Cache timeout in seconds for warmed details and configs, '
+                 'and for status if the RTTL webhook is configured (default '
+                 f'{DEFAULT_TIMEOUT}, 12 hours)')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['rate'] <= 0 or \
+                options['timeout'] < 1:
+            raise CommandError(
+                '--concurrency, --rate and --timeout must be positive')
+
+        repository = RttlInfoRepository(
+            api_client=get_rttl_client(background=True))
+        start = time.monotonic()
+
+        if options['sis_file']:
+            with open(options['sis_file']) as f:
+                sis_ids = [line.strip() for line in f if line.strip()]
+        else:
+            sis_ids = self.get_term_sis_ids(repository.api_client)
+
+        self.stdout.write(f"Warming {len(sis_ids)} courses")
+
+        interval = 1.0 / options['rate']
+        next_start = [time.monotonic()]
+        rate_lock = threading.Lock()
+
+        def warm(sis_id):
+            with rate_lock:
+                delay = next_start[0] - time.monotonic()
+                next_start[0] = max(next_start[0], time.monotonic()) + \
+                    interval
+            if delay > 0:
+                time.sleep(delay)
+            return repository.warm_course(sis_id, options['timeout'])
+
+        keys = 0
+        size = 0
+        failed = 0
+        with ThreadPoolExecutor(
+                max_workers=options['concurrency']) as executor:
+            futures = {executor.submit(warm, sis_id): sis_id
+                       for sis_id in sis_ids}
+            for future in as_completed(futures):
+                try:
+                    entries = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Error warming {futures[future]}: {e}")
+                    continue
+                keys += len(entries)
+                size += sum(len(pickle.dumps(value))
+                            for value in entries.values())
+
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            f"Warmed {keys} keys ({size} bytes) for "
+            f"{len(sis_ids) - failed} courses in {elapsed:.1f}s, "
+            f"{failed} failed")
+
+    def get_term_sis_ids(self, client):
+        """
+        SIS IDs of courses and admin courses in the current or next term.
+        """
+        current_term = get_term_calendar().get_current_term()
+        current = (current_term['year'],
+                   get_term_from_string(current_term['quarter']))
+        terms = {current, get_next_term(*current)}
+
+        sis_ids = set()
+        for course in (client.list_courses(use_cache=False) +
+                       client.list_admin_courses(use_cache=False)):
+            try:
+                _, sis = validate_source_sis(course.get('sis_course_id'))
+                term = (int(sis.group(1)), get_term_from_string(sis.group(2)))
+            except ValueError:
+                continue
+            if term in terms:
+                sis_ids.add(course['sis_course_id'])
+
+        return sorted(sis_ids)
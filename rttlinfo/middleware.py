@@ -0,0 +1,124 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+import time
+from logging import getLogger
+from django.conf import settings
+from django.urls import reverse
+from .profiling import (
+    PROFILE_HEADER, get_profile_store, is_profile_token, profile_request)
+from .request_cache import start_request_memo, end_request_memo
+from .server_timing import start_server_timing, end_server_timing
+logger = getLogger(__name__)
+
+
+class RequestMemoMiddleware:
+    """
+    Give each request a fresh request-local memo for repository lookups
+    and log how many shared cache reads it saved.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_request_memo()
+        try:
+            return self.get_response(request)
+        finally:
+            memo = end_request_memo(token)
+            if memo.hits:
+                logger.debug(
+                    f"{request.path}: {memo.hits} deduplicated lookups, "
+                    f"{memo.misses} shared cache lookups")
+
+
+class SessionlessApiMiddleware:
+    """
+    Serve the token-authorized hub data endpoint directly, skipping the
+    rest of the middleware stack so the request never loads the session
+    or logs in the LTI user. List it after SecurityMiddleware and
+    XFrameOptionsMiddleware, so the response still gets their headers,
+    and before any middleware that reads the session; the session and
+    user that SessionMiddleware and AuthenticationMiddleware attach are
+    only loaded when read.
+    """
+
+    def __init__(self, get_response):
+        from .views import HubDataTokenApiView
+        self.get_response = get_response
+        self.view = HubDataTokenApiView.as_view()
+        self.path = None
+
+    def __call__(self, request):
+        if self.path is None:
+            self.path = reverse('hub-data-token-api')
+        if request.path == self.path:
+            return self.view(request)
+        return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """
+    Profile a sample of requests with cProfile, plus any request carrying
+    a signed X-Rttl-Profile header, and save the profiles to a rotating
+    local directory. List it first in MIDDLEWARE so the profile includes
+    session and authentication work.
+
+    RTTL_PROFILE_SAMPLE_RATE is the fraction of requests profiled (default
+    0, header only).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'RTTL_PROFILE_SAMPLE_RATE', 0)
+        self.store = get_profile_store()
+
+    def __call__(self, request):
+        header = request.META.get(PROFILE_HEADER)
+        requested = bool(header) and is_profile_token(header)
+        if not requested and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response, profile = profile_request(self.get_response, request)
+        elapsed = time.perf_counter() - start
+        if profile is None:
+            return response
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name or match.func.__name__) if match \
+            else 'unresolved'
+        try:
+            name = self.store.save(profile, view_name, elapsed)
+            if requested:
+                response['X-Rttl-Profile'] = name
+        except OSError as e:
+            logger.error(f"Error saving profile for {request.path}: {e}")
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Collect the time each request spends in session I/O, cache reads,
+    RTTL API calls, the term lookup, JSON encoding and template rendering,
+    and send it in a Server-Timing header for views using
+    ServerTimingMixin. List it first in MIDDLEWARE so the timings include
+    the session save and token-authorized hub data requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        token = start_server_timing()
+        try:
+            response = self.get_response(request)
+        finally:
+            timing = end_server_timing(token)
+        if timing.enabled:
+            response['Server-Timing'] = timing.header(
+                total=time.perf_counter() - start)
+        return response
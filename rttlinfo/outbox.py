@@ -0,0 +1,320 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import random
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+from .api.clients.rttl_client import (
+    get_rttl_client, RttlApiError, RttlRateLimitError)
+from .api.repositories.rttl_repository import RttlInfoRepository
+from .sis_id import SisId
+logger = getLogger(__name__)
+
+QUEUED = 'queued'
+SENT = 'sent'
+FAILED = 'failed'
+PENDING_CACHE_PREFIX = 'rttl_outbox_pending'
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sis_course_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    claimed_until REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_course ON outbox (sis_course_id, state, id);
+"""
+
+
+class Outbox:
+    """
+    Course status submissions waiting to be sent to the RTTL API, persisted
+    in a SQLite file until it has accepted them.
+
+    Submissions for a course are delivered in the order they were queued;
+    a later one is not sent while an earlier one is still being retried.
+    Failed sends are retried with exponential backoff up to max_attempts,
+    except for client errors (4xx), which will not succeed on retry.
+
+    Each pod has its own file, drained by a sender thread in each of the
+    pod's worker processes; a row is claimed before it is sent so that
+    only one of them sends it. SQLite locking is not reliable on network
+    volumes, so the file must not be shared between pods. The state of
+    unsent submissions is also kept in the shared cache, so that every
+    pod can list a course's queued submissions.
+    """
+    retry_base = 5
+    retry_max = 15 * 60
+    claim_timeout = 120
+    retention = 7 * 24 * 60 * 60
+
+    def __init__(self, path, max_attempts, poll_interval):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def enqueue(self, status_data):
+        """
+        Queue a CourseStatusUpdate.to_api_data() payload and wake the
+        sender. Returns the outbox id.
+        """
+        now = time.time()
+        sis_id = SisId.parse(status_data['sis_course_id'])
+        with self._connect() as db:
+            cursor = db.execute(
+                "INSERT INTO outbox (sis_course_id, payload, state, created,"
+                " next_attempt) VALUES (?, ?, ?, ?, ?)",
+                (str(sis_id), json.dumps(status_data), QUEUED, now, now))
+            outbox_id = cursor.lastrowid
+        self._share(sis_id, outbox_id, {
+            'state': QUEUED, 'created': now, 'attempts': 0})
+        logger.info(f"Queued status submission {outbox_id} for "
+                    f"{status_data['sis_course_id']}")
+        self.start()
+        self._wakeup.set()
+        return outbox_id
+
+    def pending(self, course_sis_id):
+        """
+        Submissions for a course the RTTL API has not yet accepted, queued
+        in any pod, oldest first, including ones that failed permanently.
+        """
+        try:
+            sis_id = SisId.parse(course_sis_id)
+        except ValueError:
+            return []
+        entries = dict(cache.get(sis_id.cache_key(PENDING_CACHE_PREFIX)) or {})
+        # This pod's own rows are authoritative, even if the shared entry
+        # was lost or has expired
+        with self._connect() as db:
+            for row in db.execute(
+                    "SELECT id, state, created, attempts FROM outbox"
+                    " WHERE sis_course_id = ? AND state != ?",
+                    (str(sis_id), SENT)):
+                entries[self._entry_key(row['id'])] = {
+                    'state': row['state'], 'created': row['created'],
+                    'attempts': row['attempts']}
+        return [{
+            'id': key,
+            'state': entry['state'],
+            'created': datetime.fromtimestamp(entry['created']),
+            'attempts': entry['attempts'],
+        } for key, entry in sorted(entries.items(),
+                                   key=lambda item: item[1]['created'])]
+
+    @staticmethod
+    def _entry_key(outbox_id):
+        return f"{socket.gethostname()}:{outbox_id}"
+
+    def _share(self, sis_id, outbox_id, entry):
+        """
+        Record the state of an unsent submission in the shared cache, or
+        remove it once sent (entry None). Entries of a course are updated
+        without a lock; one lost to a concurrent update in another pod
+        only hides that submission from the other pods' listings.
+        """
+        try:
+            key = SisId.parse(sis_id).cache_key(PENDING_CACHE_PREFIX)
+            entries = dict(cache.get(key) or {})
+            if entry is None:
+                entries.pop(self._entry_key(outbox_id), None)
+            else:
+                entries[self._entry_key(outbox_id)] = entry
+            if entries:
+                cache.set(key, entries, timeout=self.retention)
+            else:
+                cache.delete(key)
+        except Exception as e:
+            logger.error(f"Error sharing outbox entry {outbox_id}: {e}")
+
+    def drain(self, client):
+        """
+        Send the oldest queued submission of each course that is due.
+        Returns the number sent.
+        """
+        now = time.time()
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT id, sis_course_id, payload, created, attempts"
+                " FROM outbox"
+                " WHERE id IN (SELECT MIN(id) FROM outbox WHERE state = ?"
+                " GROUP BY sis_course_id)"
+                " AND next_attempt <= ? AND claimed_until <= ?",
+                (QUEUED, now, now)).fetchall()
+            db.execute("DELETE FROM outbox WHERE state != ? AND finished < ?",
+                       (QUEUED, now - self.retention))
+
+        sent = 0
+        for row in rows:
+            if self._claim(row['id']) and self._send(client, row):
+                sent += 1
+        return sent
+
+    def _claim(self, outbox_id):
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE outbox SET claimed_until = ? WHERE id = ?"
+                " AND state = ? AND claimed_until <= ?",
+                (now + self.claim_timeout, outbox_id, QUEUED, now))
+            return cursor.rowcount == 1
+
+    def _send(self, client, row):
+        attempts = row['attempts'] + 1
+        try:
+            client.create_or_update_course_status(json.loads(row['payload']))
+        except RttlRateLimitError as e:
+            # Not sent, so not an attempt; try again once there is budget
+            logger.info(f"Status submission {row['id']} for "
+                        f"{row['sis_course_id']} deferred: {e}")
+            with self._connect() as db:
+                db.execute(
+                    "UPDATE outbox SET next_attempt = ?, claimed_until = 0"
+                    " WHERE id = ?",
+                    (time.time() + e.retry_after, row['id']))
+            return False
+        except Exception as e:
+            status_code = getattr(e, 'status_code', None)
+            permanent = isinstance(e, RttlApiError) and status_code and \
+                400 <= status_code < 500 and status_code not in (408, 429)
+            if permanent or attempts >= self.max_attempts:
+                logger.error(f"Giving up on status submission {row['id']} "
+                             f"for {row['sis_course_id']}: {e}")
+                self._finish(row, FAILED, attempts, str(e))
+            else:
+                delay = min(self.retry_max, self.retry_base * 2 ** attempts)
+                delay *= random.uniform(0.5, 1)
+                logger.warning(f"Status submission {row['id']} for "
+                               f"{row['sis_course_id']} failed, retrying in "
+                               f"{delay:.0f}s: {e}")
+                with self._connect() as db:
+                    db.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt = ?,"
+                        " claimed_until = 0, last_error = ? WHERE id = ?",
+                        (attempts, time.time() + delay, str(e), row['id']))
+                self._share(row['sis_course_id'], row['id'], {
+                    'state': QUEUED, 'created': row['created'],
+                    'attempts': attempts})
+            return False
+
+        self._finish(row, SENT, attempts, None)
+        RttlInfoRepository(api_client=client).invalidate_course(
+            row['sis_course_id'])
+        logger.info(f"Sent status submission {row['id']} for "
+                    f"{row['sis_course_id']}")
+        return True
+
+    def _finish(self, row, state, attempts, error):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE outbox SET state = ?, attempts = ?, last_error = ?,"
+                " finished = ?, claimed_until = 0 WHERE id = ?",
+                (state, attempts, error, time.time(), row['id']))
+        self._share(row['sis_course_id'], row['id'], None if state == SENT
+                    else {'state': state, 'created': row['created'],
+                          'attempts': attempts})
+
+    def start(self):
+        """
+        Start the background sender for this process if it is not running.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(get_rttl_client(use_cache=False),),
+                    daemon=True, name="rttl-outbox")
+                self._thread.start()
+
+    def _run(self, client):
+        while True:
+            self._wakeup.clear()
+            try:
+                # Keep going while there is work that is already due
+                while self.drain(client):
+                    pass
+            except Exception as e:
+                logger.error(f"Error draining outbox {self.path}: {e}")
+            self._wakeup.wait(self.poll_interval)
+
+
+def get_outbox():
+    """
+    Return the process-wide Outbox, with its sender running, or None if
+    RTTL_OUTBOX_PATH is None.
+    """
+    global _outbox
+    path = getattr(settings, 'RTTL_OUTBOX_PATH',
+                   '/tmp/rttlinfo_outbox.sqlite3')
+    if not path:
+        return None
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = Outbox(
+                path,
+                getattr(settings, 'RTTL_OUTBOX_MAX_ATTEMPTS', 20),
+                getattr(settings, 'RTTL_OUTBOX_POLL_INTERVAL', 5))
+            _outbox.start()
+        return _outbox
+
+
+def get_pending_submissions(course_sis_id):
+    """
+    Outbox.pending() for the process-wide outbox, or an empty list if
+    there is none or it cannot be read.
+    """
+    try:
+        outbox = get_outbox()
+        return outbox.pending(course_sis_id) if outbox else []
+    except Exception as e:
+        logger.error(f"Error reading outbox for {course_sis_id}: {e}")
+        return []
+
+
+def submit_status(client, status_data):
+    """
+    Queue a CourseStatusUpdate.to_api_data() payload in the outbox, to be
+    sent in the background. Returns (None, outbox id), or if there is no
+    outbox, sends it now and returns (response data, None).
+    """
+    outbox = get_outbox()
+    if outbox is not None:
+        return None, outbox.enqueue(status_data)
+
+    data = client.create_or_update_course_status(status_data)
+    RttlInfoRepository(api_client=client).invalidate_course(
+        status_data['sis_course_id'])
+    return data, None
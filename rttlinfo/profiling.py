@@ -0,0 +1,156 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import cProfile
+import os
+import pstats
+import re
+import tempfile
+import time
+from collections import defaultdict
+from logging import getLogger
+from django.conf import settings
+from django.core import signing
+logger = getLogger(__name__)
+
+TOKEN_SALT = 'rttlinfo.profiling'
+PROFILE_HEADER = 'HTTP_X_RTTL_PROFILE'
+PROFILE_SUFFIX = '.prof'
+
+
+def make_profile_token():
+    """
+    Mint a signed value for the X-Rttl-Profile request header, which
+    profiles any request carrying it.
+    """
+    return signing.dumps('profile', salt=TOKEN_SALT)
+
+
+def is_profile_token(token):
+    """
+    Whether a token was minted by make_profile_token no more than
+    RTTL_PROFILE_TOKEN_MAX_AGE seconds ago.
+    """
+    try:
+        return signing.loads(token, salt=TOKEN_SALT, max_age=getattr(
+            settings, 'RTTL_PROFILE_TOKEN_MAX_AGE', 60 * 60)) == 'profile'
+    except signing.BadSignature:
+        logger.warning("Ignoring profile header with bad signature")
+        return False
+
+
+def get_profile_dir():
+    return getattr(settings, 'RTTL_PROFILE_DIR', os.path.join(
+        tempfile.gettempdir(), 'rttlinfo_profiles'))
+
+
+class ProfileStore:
+    """
+    cProfile output saved in a directory as one file per request, named
+    for the view and the time it took. Only the newest max_files are
+    kept.
+    """
+
+    def __init__(self, path, max_files):
+        self.path = path
+        self.max_files = max_files
+
+    def save(self, profile, view_name, elapsed):
+        """
+        Write a request's profile and rotate out the oldest files. Returns
+        the file name.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        view_name = re.sub(r'[^\w-]', '_', view_name)
+        name = (f"{time.time():.6f}-{os.getpid()}-{view_name}-"
+                f"{elapsed * 1000:.0f}ms{PROFILE_SUFFIX}")
+        profile.dump_stats(os.path.join(self.path, name))
+        self.rotate()
+        return name
+
+    def files(self, view_name=None):
+        """
+        Profile file paths, oldest first, optionally for one view.
+        """
+        try:
+            names = sorted(name for name in os.listdir(self.path)
+                           if name.endswith(PROFILE_SUFFIX))
+        except FileNotFoundError:
+            return []
+        if view_name is not None:
+            names = [name for name in names
+                     if _parse_name(name)[0] == view_name]
+        return [os.path.join(self.path, name) for name in names]
+
+    def rotate(self):
+        files = self.files()
+        for path in files[:max(0, len(files) - self.max_files)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Rotated by another worker
+
+    def summary(self, limit=20):
+        """
+        Per view: the number of profiled requests, their mean elapsed
+        time, and the functions with the highest mean cumulative time per
+        request.
+        """
+        by_view = defaultdict(list)
+        for path in self.files():
+            by_view[_parse_name(os.path.basename(path))[0]].append(path)
+
+        summary = {}
+        for view_name, paths in sorted(by_view.items()):
+            try:
+                stats = pstats.Stats(*paths)
+            except Exception as e:
+                logger.error(f"Error reading profiles for {view_name}: {e}")
+                continue
+            count = len(paths)
+            hot_spots = sorted(
+                stats.stats.items(), key=lambda item: item[1][3],
+                reverse=True)[:limit]
+            summary[view_name] = {
+                'requests': count,
+                'mean_ms': sum(_parse_name(os.path.basename(path))[1]
+                               for path in paths) / count,
+                'hot_spots': [{
+                    'function': pstats.func_std_string(func),
+                    'calls': calls / count,
+                    'cumulative_ms': cumulative * 1000 / count,
+                    'own_ms': own * 1000 / count,
+                } for func, (_, calls, own, cumulative, _) in hot_spots],
+            }
+        return summary
+
+
+def _parse_name(name):
+    # "<time>-<pid>-<view>-<elapsed>ms.prof" -> (view, elapsed ms)
+    rest = name[:-len(PROFILE_SUFFIX)].split('-', 2)[-1]
+    view_name, _, elapsed = rest.rpartition('-')
+    try:
+        return view_name, float(elapsed.rstrip('ms'))
+    except ValueError:
+        return view_name, 0.0
+
+
+def get_profile_store():
+    return ProfileStore(get_profile_dir(), getattr(
+        settings, 'RTTL_PROFILE_MAX_FILES', 200))
+
+
+def profile_request(get_response, request):
+    """
+    Run get_response under cProfile. Returns (response, profile), with
+    profile None if another profiler is already active in this thread.
+    """
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        return get_response(request), None
+    try:
+        return get_response(request), profile
+    finally:
+        profile.disable()
@@ -0,0 +1,241 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+from .sis_id import SisId
+logger = getLogger(__name__)
+
+STATUS = 'course'
+DETAILS = 'details'
+CONFIGS = 'configs'
+
+# Invalidation times are shared for longer than a replica is served stale
+INVALIDATED_CACHE_PREFIX = 'rttl_replica_invalidated'
+INVALIDATED_TIMEOUT = 24 * 60 * 60
+
+_replica = None
+_replica_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS course (
+    id INTEGER PRIMARY KEY,
+    sis_course_id TEXT NOT NULL,
+    last_changed TEXT,
+    course TEXT NOT NULL,
+    details TEXT,
+    configs TEXT,
+    stale INTEGER NOT NULL DEFAULT 0,
+    invalidated REAL
+);
+CREATE INDEX IF NOT EXISTS course_sis ON course (sis_course_id);
+CREATE TABLE IF NOT EXISTS sync (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class Replica:
+    """
+    A local SQLite copy of every RTTL course record (with its latest
+    status), course details and configurations, for reads that can
+    tolerate data as old as the last sync.
+
+    A sync lists all courses, which also refreshes their latest status.
+    Each row keeps the last_changed it was replicated at as its
+    watermark, and details and configs are fetched only for courses whose
+    last_changed has moved since, or that were invalidated after a write.
+    Rows that could not be fetched are marked stale and not served.
+
+    Invalidating a course marks its rows stale, or adds a stale
+    placeholder row (with a negative id) for a course the replica does
+    not have yet, so that it is not answered as missing. Only a sync that
+    started after the invalidation makes the course fresh again.
+
+    Each pod has its own replica, so the invalidation time is also kept in
+    the shared cache, and no pod serves the course from a replica last
+    synced before it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+            columns = [row['name'] for row in
+                       db.execute("PRAGMA table_info(course)")]
+            if 'invalidated' not in columns:
+                # Replica files created before invalidation times
+                db.execute("ALTER TABLE course ADD COLUMN invalidated REAL")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute('PRAGMA journal_mode=WAL')
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _get_sync(self, db, key):
+        row = db.execute(
+            "SELECT value FROM sync WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def synced(self):
+        """
+        When the last sync started, as a timestamp, or None.
+        """
+        with self._connect() as db:
+            value = self._get_sync(db, 'synced')
+        return float(value) if value else None
+
+    def get(self, course_sis_id, kind, max_staleness):
+        """
+        Return a course's replicated STATUS (list_courses data), DETAILS
+        or CONFIGS, or None if the replica was last synced more than
+        max_staleness seconds ago or does not have it.
+        """
+        sis_id = SisId.parse(course_sis_id)
+        invalidated = cache.get(sis_id.cache_key(INVALIDATED_CACHE_PREFIX))
+        with self._connect() as db:
+            synced = self._get_sync(db, 'synced')
+            if not synced or time.time() - float(synced) > max_staleness:
+                return None
+            if invalidated is not None and float(synced) <= invalidated:
+                # Changed, possibly through another pod, since the sync
+                return None
+            rows = db.execute(
+                f"SELECT {kind} AS data, stale FROM course"
+                f" WHERE sis_course_id = ? ORDER BY id",
+                (str(sis_id),)).fetchall()
+
+        if any(row['stale'] for row in rows):
+            return None
+        if kind == STATUS:
+            # Not in a fresh replica means the course does not exist
+            return [json.loads(row['data']) for row in rows]
+        if len(rows) != 1 or rows[0]['data'] is None:
+            return None
+        return json.loads(rows[0]['data'])
+
+    def invalidate(self, course_sis_id):
+        """
+        Stop serving a course, from this or any other pod's replica, until
+        a sync started after now has refetched it.
+        """
+        sis_id = SisId.parse(course_sis_id)
+        now = time.time()
+        cache.set(sis_id.cache_key(INVALIDATED_CACHE_PREFIX), now,
+                  timeout=INVALIDATED_TIMEOUT)
+        sis_id = str(sis_id)
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE course SET stale = 1, invalidated = ?"
+                " WHERE sis_course_id = ?", (now, sis_id))
+            if not cursor.rowcount:
+                db.execute(
+                    "INSERT INTO course (id, sis_course_id, course, stale,"
+                    " invalidated) SELECT MIN(0, IFNULL(MIN(id), 0)) - 1,"
+                    " ?, 'null', 1, ? FROM course", (sis_id, now))
+
+    def sync(self, client, concurrency=4):
+        """
+        Bring the replica up to date with the RTTL API. Returns the number
+        of courses whose details and configs were fetched.
+        """
+        start = time.time()
+        courses = client.list_courses(use_cache=False)
+
+        with self._connect() as db:
+            known = {row['id']: (row['last_changed'], row['stale'])
+                     for row in db.execute(
+                         "SELECT id, last_changed, stale FROM course")}
+        changed = [course for course in courses
+                   if known.get(course['id']) !=
+                   (course.get('last_changed'), 0)]
+
+        def fetch(course):
+            try:
+                return (course['id'], course.get('last_changed'),
+                        json.dumps(client.get_course(
+                            course['id'], use_cache=False)),
+                        json.dumps(client.list_course_configs(
+                            course['id'], use_cache=False)), 0)
+            except Exception as e:
+                logger.error(f"Error replicating course {course['id']}: {e}")
+                return (course['id'], None, None, None, 1)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            fetched = list(executor.map(fetch, changed))
+
+        with self._connect() as db:
+            db.executemany(
+                "INSERT INTO course (id, sis_course_id, course, stale)"
+                " VALUES (?, ?, ?, 1) ON CONFLICT (id) DO UPDATE SET"
+                " sis_course_id = excluded.sis_course_id,"
+                " course = excluded.course",
+                [(course['id'], _sis_id(course), json.dumps(course))
+                 for course in courses])
+            # Rows invalidated since the listing stay stale, as what was
+            # fetched may predate the change
+            db.executemany(
+                "UPDATE course SET last_changed = ?, details = ?,"
+                " configs = ?, stale = MAX(?, IFNULL(invalidated, 0) > ?)"
+                " WHERE id = ?",
+                [(last_changed, details, configs, stale, start, course_id)
+                 for course_id, last_changed, details, configs, stale
+                 in fetched])
+
+            # Courses no longer listed have been deleted upstream, and
+            # placeholders are replaced by the listing, unless invalidated
+            # since it was taken
+            db.execute("CREATE TEMP TABLE listed (id INTEGER PRIMARY KEY)")
+            db.executemany("INSERT INTO listed VALUES (?)",
+                           [(course['id'],) for course in courses])
+            db.execute("DELETE FROM course WHERE id NOT IN"
+                       " (SELECT id FROM listed)"
+                       " AND IFNULL(invalidated, 0) <= ?", (start,))
+            db.execute("INSERT OR REPLACE INTO sync (key, value)"
+                       " VALUES ('synced', ?)", (str(start),))
+
+        failed = sum(row[-1] for row in fetched)
+        logger.info(f"Synced replica {self.path}: {len(courses)} courses, "
+                    f"{len(fetched) - failed} changed, {failed} failed, "
+                    f"{time.time() - start:.1f}s")
+        return len(fetched) - failed
+
+
+def _sis_id(course):
+    sis_course_id = course.get('sis_course_id')
+    return str(SisId.parse(sis_course_id)) if sis_course_id else ''
+
+
+def get_replica():
+    """
+    Return the process-wide Replica, or None unless
+    RTTL_REPLICA_MAX_STALENESS is set.
+    """
+    global _replica
+    if getattr(settings, 'RTTL_REPLICA_MAX_STALENESS', None) is None:
+        return None
+    with _replica_lock:
+        if _replica is None:
+            _replica = Replica(get_replica_path())
+        return _replica
+
+
+def get_replica_path():
+    return getattr(settings, 'RTTL_REPLICA_PATH', os.path.join(
+        tempfile.gettempdir(), 'rttlinfo_replica.sqlite3'))
@@ -0,0 +1,64 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from contextvars import ContextVar
+from .server_timing import count_hit
+
+_request_memo = ContextVar('rttlinfo_request_memo', default=None)
+
+
+class RequestMemo:
+    """
+    Values looked up during one request, with counts of lookups answered
+    from the memo (deduplicated) and lookups passed to the shared cache.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+
+def start_request_memo():
+    """
+    Start a new request-local memo, returning a token for end_request_memo.
+    """
+    return _request_memo.set(RequestMemo())
+
+
+def end_request_memo(token):
+    """
+    Discard the current request-local memo and return it.
+    """
+    memo = _request_memo.get()
+    _request_memo.reset(token)
+    return memo
+
+
+def memo_get(key, loader):
+    """
+    Return the value for key from the request-local memo, calling
+    loader() on the first lookup in a request. Outside a request, loader
+    is always called.
+    """
+    memo = _request_memo.get()
+    if memo is None:
+        return loader()
+    if key in memo.values:
+        memo.hits += 1
+        count_hit('cache-memo', 'Request memo')
+        return memo.values[key]
+    memo.misses += 1
+    value = loader()
+    memo.values[key] = value
+    return value
+
+
+def memo_set(key, value):
+    """
+    Record a value just written to the shared cache, so later lookups in
+    the same request do not read it back.
+    """
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.values[key] = value
@@ -0,0 +1,148 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+_server_timing = ContextVar('rttlinfo_server_timing', default=None)
+
+
+class ServerTiming:
+    """
+    Time spent in each phase of one request, as {name: [seconds, count,
+    description]}, in the order the phases were first entered. Only
+    written to a response's Server-Timing header once a view has enabled
+    it.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.enabled = False
+
+    def add(self, name, duration, description=None):
+        metric = self.metrics.get(name)
+        if metric is None:
+            self.metrics[name] = [duration, 1, description]
+        else:
+            metric[0] += duration
+            metric[1] += 1
+
+    def header(self, total=None):
+        """
+        The Server-Timing header value, with durations in milliseconds.
+        """
+        values = []
+        for name, (duration, count, description) in self.metrics.items():
+            value = f"{name};dur={duration * 1000:.1f}"
+            if description:
+                if count > 1:
+                    description = f"{description} x{count}"
+                value += f';desc="{description}"'
+            values.append(value)
+        if total is not None:
+            values.append(f"total;dur={total * 1000:.1f}")
+        return ', '.join(values)
+
+
+def start_server_timing():
+    """
+    Start collecting timings for a request, returning a token for
+    end_server_timing.
+    """
+    return _server_timing.set(ServerTiming())
+
+
+def end_server_timing(token):
+    """
+    Stop collecting timings for the current request and return them.
+    """
+    timing = _server_timing.get()
+    _server_timing.reset(token)
+    return timing
+
+
+def enable_server_timing():
+    """
+    Mark the current request's timings to be sent in its response.
+    Returns the ServerTiming, or None outside a request.
+    """
+    timing = _server_timing.get()
+    if timing is not None:
+        timing.enabled = True
+    return timing
+
+
+@contextmanager
+def timed(name, description=None):
+    """
+    Add the time spent in the block to the current request's timings.
+    Does nothing outside a request.
+    """
+    timing = _server_timing.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start, description)
+
+
+def count_hit(name, description=None):
+    """
+    Count a lookup that took no measurable time, such as a request memo
+    hit.
+    """
+    timing = _server_timing.get()
+    if timing is not None:
+        timing.add(name, 0, description)
+
+
+def get_endpoint_metric(method, endpoint):
+    """
+    Metric name and description for an RTTL API endpoint, with ids
+    replaced so that calls to the same endpoint are added together.
+    """
+    pattern = re.sub(r'\d+', '{id}', endpoint.strip('/'))
+    name = re.sub(r'[^A-Za-z0-9]+', '-',
+                  pattern.replace('{id}', '')).strip('-')
+    return f"api-{method.lower()}-{name or 'root'}", f"{method} {pattern}"
+
+
+def _timed_method(method, name, description):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with timed(name, description):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+class ServerTimingMixin:
+    """
+    View mixin that sends the request's timings in a Server-Timing
+    header (written by ServerTimingMiddleware), adding the session load
+    and save and the template rendering.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if enable_server_timing() is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        session = getattr(request, 'session', None)
+        if session is not None:
+            # SessionMiddleware saves the session after the view returns,
+            # but still inside ServerTimingMiddleware
+            session.load = _timed_method(
+                session.load, 'session', 'Session I/O')
+            session.save = _timed_method(
+                session.save, 'session', 'Session I/O')
+
+        response = super().dispatch(request, *args, **kwargs)
+        if not getattr(response, 'is_rendered', True):
+            with timed('template', 'Template rendering'):
+                response.render()
+        return response
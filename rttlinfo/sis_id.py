@@ -0,0 +1,94 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import html
+import re
+from functools import lru_cache
+from urllib.parse import unquote_plus
+
+# Note: Cannot find a canonical source for allowed characters in curriculum
+#     codes, but a quick review of UWSDBDataStore.sec.sr_curric_code
+#     (curric_abbr) shows only A-Z, & and space are being used.
+COURSE_SIS_REGEX = re.compile(
+    "^([0-9]{4})-(autumn|winter|spring|summer){1}-([A-Z& ]+)-(.*)$")
+
+TERM_NUMBERS = {'winter': 1, 'spring': 2, 'summer': 3, 'autumn': 4}
+
+
+class SisId:
+    """
+    A course SIS ID such as '2025-autumn-PSYCH-102-A', decoded, validated
+    and parsed once. Derived cache keys are memoized on the instance.
+
+    Use SisId.parse() rather than the constructor so that hot IDs share
+    one interned instance.
+    """
+    __slots__ = ('value', 'year', 'quarter', 'term', 'curriculum',
+                 'section', '_digest', '_cache_keys')
+
+    def __init__(self, raw):
+        if raw in [None, '', 'None', 'none']:
+            raise ValueError("Invalid course_sis_id provided.")
+        # First decode URL encoding (handles both %20 and + for spaces),
+        # then decode HTML entities (e.g., &amp; -> &)
+        self.value = html.unescape(unquote_plus(raw))
+        self._digest = None
+        self._cache_keys = {}
+
+        match = COURSE_SIS_REGEX.match(self.value)
+        if match:
+            self.year = int(match.group(1))
+            self.quarter = match.group(2)
+            self.term = TERM_NUMBERS[self.quarter]
+            self.curriculum = match.group(3)
+            self.section = match.group(4)
+        else:
+            self.year = self.quarter = self.term = None
+            self.curriculum = self.section = None
+
+    @classmethod
+    def parse(cls, raw):
+        """
+        Return the interned SisId for a raw (possibly encoded) SIS ID, or
+        raw itself if it is already a SisId.
+        """
+        if isinstance(raw, cls):
+            return raw
+        return _intern_sis_id(raw)
+
+    @property
+    def is_valid(self):
+        return self.year is not None
+
+    def cache_key(self, prefix):
+        """
+        Memcached-safe cache key for data derived from this SIS ID.
+        Handles special characters in SIS IDs (spaces, ampersands, etc.)
+        """
+        key = self._cache_keys.get(prefix)
+        if key is None:
+            if self._digest is None:
+                self._digest = hashlib.md5(self.value.encode()).hexdigest()
+            key = f"{prefix}_{self._digest}"
+            self._cache_keys[prefix] = key
+        return key
+
+    def __eq__(self, other):
+        if isinstance(other, SisId):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __str__(self):
+        return self.value
+
+    def __repr__(self):
+        return f"SisId({self.value!r})"
+
+
+@lru_cache(maxsize=1024)
+def _intern_sis_id(raw):
+    return SisId(raw)
@@ -0,0 +1,164 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+from .api.clients.rttl_client import get_rttl_client
+from .sis_id import SisId
+logger = getLogger(__name__)
+
+_pollers = {}
+_pollers_lock = threading.Lock()
+_waiters = 0
+
+
+def get_status_data(course_data):
+    """
+    Project an RTTL course record onto the hub status fields, or None if
+    the course does not exist.
+    """
+    if not course_data:
+        return None
+
+    latest_status = course_data.get('latest_status')
+    if latest_status:
+        return {
+            'status': latest_status['status'],
+            'hub_deployed': latest_status.get('hub_deployed', False),
+            'message': latest_status.get('message', ''),
+            'hub_url': course_data.get('hub_url', ''),
+            'hub_admins': course_data.get('hub_admins', []),
+            'last_updated': latest_status.get('status_added')
+        }
+    return {
+        'status': 'unknown',
+        'message': 'No status information available'
+    }
+
+
+class HubStatusPoller:
+    """
+    Polls the RTTL API for one course on behalf of every request watching
+    it in this process. The upstream lookup bypasses the client cache, and
+    its result is shared with pollers in other workers under its own cache
+    key for one interval. The polling thread exits once the last watcher
+    has gone.
+    """
+
+    def __init__(self, sis_course_id, interval):
+        self.sis_course_id = sis_course_id
+        self.interval = interval
+        self.watchers = 0
+        self.status = None
+        self.token = None
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(get_rttl_client(use_cache=False),),
+                    daemon=True,
+                    name=f"hub-status-{self.sis_course_id}")
+                self._thread.start()
+
+    def _run(self, client):
+        while True:
+            with self._condition:
+                if self.watchers == 0:
+                    self._thread = None
+                    return
+
+            try:
+                status = get_status_data(self._get_course(client))
+            except Exception as e:
+                logger.error(
+                    f"Error polling status for {self.sis_course_id}: {e}")
+            else:
+                token = hashlib.md5(json.dumps(
+                    status, sort_keys=True).encode()).hexdigest()
+                with self._condition:
+                    if token != self.token:
+                        self.status, self.token = status, token
+                        self._condition.notify_all()
+
+            time.sleep(self.interval)
+
+    def _get_course(self, client):
+        cache_key = SisId.parse(self.sis_course_id).cache_key(
+            'rttl_status_poll')
+        course_data = cache.get(cache_key)
+        if course_data is None:
+            # Cached as {} when the course does not exist
+            course_data = client.get_course_by_sis_id(
+                self.sis_course_id, use_cache=False) or {}
+            cache.set(cache_key, course_data, timeout=self.interval)
+        return course_data
+
+    def wait_for_change(self, since=None, timeout=None):
+        """
+        Block until the polled status differs from the `since` token, or
+        until timeout. Returns the current (token, status) pair; token is
+        None if no poll has completed yet.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.token is not None and self.token != since,
+                timeout)
+            return self.token, self.status
+
+
+@contextmanager
+def watch_hub_status(sis_course_id):
+    """
+    Register the caller as a watcher of the shared poller for a course,
+    starting the poller if this is the first watcher.
+    """
+    interval = getattr(settings, 'RTTL_STATUS_POLL_INTERVAL', 10)
+
+    with _pollers_lock:
+        poller = _pollers.get(sis_course_id)
+        if poller is None:
+            poller = HubStatusPoller(sis_course_id, interval)
+            _pollers[sis_course_id] = poller
+        with poller._condition:
+            poller.watchers += 1
+
+    try:
+        poller.start()
+        yield poller
+    finally:
+        with _pollers_lock:
+            with poller._condition:
+                poller.watchers -= 1
+                if poller.watchers == 0 and \
+                        _pollers.get(sis_course_id) is poller:
+                    del _pollers[sis_course_id]
+
+
+@contextmanager
+def long_poll_slot():
+    """
+    Reserve one of this process's RTTL_STATUS_MAX_WAITERS long poll slots
+    for the caller. Yields whether a slot was free; if not, the caller
+    should answer at once rather than tie up another worker thread.
+    """
+    global _waiters
+    with _pollers_lock:
+        reserved = _waiters < getattr(settings, 'RTTL_STATUS_MAX_WAITERS', 0)
+        if reserved:
+            _waiters += 1
+    try:
+        yield reserved
+    finally:
+        if reserved:
+            with _pollers_lock:
+                _waiters -= 1
@@ -0,0 +1,168 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from logging import getLogger
+from django.conf import settings
+from .server_timing import timed
+logger = getLogger(__name__)
+
+_term_calendar = None
+_term_calendar_lock = threading.Lock()
+
+
+class TermCalendar:
+    """
+    Grade submission deadlines for the current and upcoming terms, held in
+    memory and persisted to a local JSON file so that finding the current
+    term never waits on SWS.
+
+    The calendar is refreshed from SWS in a background thread once it is
+    older than max_age. If a refresh fails, the last known good calendar
+    (in memory or on disk) stays in use. Only a worker with no calendar at
+    all waits for SWS, and then for at most refresh_timeout seconds.
+    """
+    term_count = 8
+    retry_interval = 300
+
+    def __init__(self, path, max_age, refresh_timeout):
+        self.path = path
+        self.max_age = max_age
+        self.refresh_timeout = refresh_timeout
+        self.terms = None
+        self.refreshed = 0
+        self._last_attempt = 0
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+    def get_current_term(self, now=None):
+        """
+        Return the current term as a {'year': int, 'quarter': str} dict.
+        Matching uw_sws, a term stays current until its grade submission
+        deadline has passed.
+        """
+        now = now or datetime.now()
+        with timed('sws-term', 'SWS term lookup'):
+            terms = self.get_terms()
+        for term in terms:
+            deadline = term['grade_submission_deadline']
+            if deadline is not None and deadline >= now:
+                return {'year': term['year'], 'quarter': term['quarter']}
+        raise Exception(f"Term calendar has no term current at {now}")
+
+    def get_terms(self):
+        if self._is_stale():
+            self.refresh(wait=self.terms is None)
+            if self.terms is None:
+                raise Exception("Term calendar is unavailable")
+        return self.terms
+
+    def _is_stale(self):
+        return time.time() - self.refreshed > self.max_age
+
+    def refresh(self, wait=False):
+        """
+        Start a background refresh from SWS unless one is already running,
+        the last attempt was too recent, or another worker has refreshed
+        the file. With wait, block for at most refresh_timeout seconds.
+        """
+        with self._lock:
+            thread = self._refresh_thread
+            if thread is None or not thread.is_alive():
+                if time.time() - self._last_attempt < self.retry_interval:
+                    return
+                self._last_attempt = time.time()
+                self.load()
+                if not self._is_stale():
+                    return
+                thread = threading.Thread(
+                    target=self._refresh, daemon=True,
+                    name="term-calendar-refresh")
+                self._refresh_thread = thread
+                thread.start()
+        if wait:
+            thread.join(self.refresh_timeout)
+
+    def _refresh(self):
+        try:
+            # Imported here so that workers with a calendar file on disk
+            # never pay for importing uw_sws
+            from uw_sws import term as sws_term
+            terms = []
+            term = sws_term.get_current_term()
+            for _ in range(self.term_count):
+                terms.append({
+                    'year': term.year,
+                    'quarter': term.quarter.lower(),
+                    'grade_submission_deadline':
+                        term.grade_submission_deadline,
+                })
+                term = sws_term.get_term_after(term)
+        except Exception as e:
+            logger.error(f"Error refreshing term calendar from SWS: {e}")
+            return
+
+        self.terms = terms
+        self.refreshed = time.time()
+        logger.info(f"Refreshed term calendar: {len(terms)} terms")
+        self.save()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            terms = [dict(term, grade_submission_deadline=_parse_datetime(
+                term['grade_submission_deadline'])) for term in data['terms']]
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Error loading term calendar {self.path}: {e}")
+            return
+
+        if data['refreshed'] > self.refreshed:
+            self.terms = terms
+            self.refreshed = data['refreshed']
+
+    def save(self):
+        data = {
+            'refreshed': self.refreshed,
+            'terms': [dict(term, grade_submission_deadline=_format_datetime(
+                term['grade_submission_deadline'])) for term in self.terms],
+        }
+        try:
+            # Write then rename, so other workers never read a partial file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.path) or '.')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving term calendar {self.path}: {e}")
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def _format_datetime(value):
+    return value.isoformat() if value else None
+
+
+def get_term_calendar():
+    """
+    Return the process-wide TermCalendar, configured from settings.
+    """
+    global _term_calendar
+    with _term_calendar_lock:
+        if _term_calendar is None:
+            _term_calendar = TermCalendar(
+                getattr(settings, 'RTTL_TERM_CALENDAR_PATH', os.path.join(
+                    tempfile.gettempdir(), 'rttlinfo_term_calendar.json')),
+                getattr(settings, 'RTTL_TERM_CALENDAR_MAX_AGE', 60 * 60 * 24),
+                getattr(settings, 'RTTL_TERM_CALENDAR_TIMEOUT', 5))
+        return _term_calendar
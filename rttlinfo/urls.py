@@ -6,15 +6,30 @@ from django.views.decorators.csrf import csrf_exempt
 from .views import \
     LaunchView, \
     HubDataApiView, \
+    HubDataTokenApiView, \
+    HubStatusApiView, \
+    RttlWebhookApiView, \
     HubRequestView, \
     HubManageView, \
-    HomeView
+    HomeView, \
+    AdminExportView, \
+    CapacityDashboardView
 
 urlpatterns = [
     # LTI launch throws CSRF errors since it's a POST from external domain
     re_path(r'^$', csrf_exempt(LaunchView.as_view()), name='lti-launch'),
     re_path(r'^home/$', HomeView.as_view(), name='home'),
     re_path(r'^api/hub-data/$', HubDataApiView.as_view(), name='hub-data-api'),
+    re_path(r'^api/hub-data/token/$', HubDataTokenApiView.as_view(),
+            name='hub-data-token-api'),
+    re_path(r'^api/hub-status/$', HubStatusApiView.as_view(),
+            name='hub-status-api'),
+    re_path(r'^api/rttl-webhook/$', RttlWebhookApiView.as_view(),
+            name='rttl-webhook-api'),
+    re_path(r'^api/admin-export/$', AdminExportView.as_view(),
+            name='admin-export-api'),
+    re_path(r'^capacity/$', CapacityDashboardView.as_view(),
+            name='capacity-dashboard'),
     re_path(r'^manage/$', HubManageView.as_view(), name="hub-manage"),
     re_path(r'^request/$', HubRequestView.as_view(), name="hub-request"),
 ]
@@ -1,8 +1,8 @@
-import re
-from uw_sws import term as sws_term
 from django.core.cache import cache
 from datetime import datetime, time, timedelta
 from logging import getLogger
+from .sis_id import COURSE_SIS_REGEX, TERM_NUMBERS, SisId
+from .term_calendar import get_term_calendar
 logger = getLogger(__name__)
 
 
@@ -31,22 +31,26 @@ def get_term_from_string(term_string):
         raise ValueError(f"Invalid term string: {term_string}")
 
 
+def get_next_term(year, term):
+    """
+    Return the (year, term) pair following the given term, where term is
+    a term integer as returned by get_term_from_string.
+    """
+    if term == 4:
+        return year + 1, 1
+    return year, term + 1
+
+
 def validate_source_sis(source_sis):
     """
-    Validate the source SIS ID.
-    Note: Cannot find a canonical source for allowed characters in curriculum
-        codes, but a quick review of UWSDBDataStore.sec.sr_curric_code
-        (curric_abbr) shows only A-Z, & and space are being used.
+    Validate the source SIS ID against COURSE_SIS_REGEX.
     Note: non-standard IDs are possible for non-canvas courses, but irrelevant
     to this app.
     """
-    COURSE_SIS_REGEX = \
-        "^([0-9]{4})-(autumn|winter|spring|summer){1}-([A-Z& ]+)-(.*)$"
-
     if not source_sis:
         raise ValueError("Source SIS ID cannot be empty.")
 
-    sis = re.match(COURSE_SIS_REGEX, source_sis)
+    sis = COURSE_SIS_REGEX.match(source_sis)
     if not sis:
         raise ValueError(f"Invalid source SIS ID format: {source_sis}")
 
@@ -61,17 +65,19 @@ def get_course_eligibility(course_sis):
     """
     logger.debug(f"Checking course eligibility for SIS ID: {course_sis}")
     try:
-        # This also handles the case where source_sis is None or empty
-        source_sis, sis = validate_source_sis(course_sis)
-        course_year = int(sis.groups()[0])
-        course_term = get_term_from_string(sis.groups()[1])
-    except ValueError as e:
+        # This also handles the case where course_sis is None or empty
+        sis_id = SisId.parse(course_sis)
+    except ValueError:
         return False
+    if not sis_id.is_valid:
+        return False
+    course_year = sis_id.year
+    course_term = sis_id.term
     today = datetime.now().date()
     if course_year > today.year:
         # We can skip calling sws_term.get_current_term() here
         return True
-    current_term = get_term_from_sws()
+    current_term = get_term_calendar().get_current_term()
     logger.debug(f"Current term: {current_term}")
     if course_year < current_term['year']:
         return False
@@ -81,6 +87,48 @@ def get_course_eligibility(course_sis):
     return True
 
 
+def get_course_eligibility_bulk(course_sis_ids):
+    """
+    Determine eligibility for many SIS IDs at once, applying the same rules
+    as get_course_eligibility. The current term is looked up once, and only
+    if some course is not in a future year.
+
+    Returns a dict mapping each SIS ID to None if the course is eligible,
+    or to a string giving the reason it is not.
+    """
+    today_year = datetime.now().year
+    current = None
+    results = {}
+
+    for course_sis in course_sis_ids:
+        if not course_sis:
+            results[course_sis] = "Source SIS ID cannot be empty."
+            continue
+        sis = COURSE_SIS_REGEX.match(course_sis)
+        if not sis:
+            results[course_sis] = "Invalid source SIS ID format"
+            continue
+
+        course_year = int(sis.group(1))
+        if course_year > today_year:
+            results[course_sis] = None
+            continue
+
+        if current is None:
+            current_term = get_term_calendar().get_current_term()
+            current = (current_term['year'],
+                       get_term_from_string(current_term['quarter']))
+            past_reason = (f"Course term is before the current term "
+                           f"({current_term['quarter']} {current[0]})")
+
+        if (course_year, TERM_NUMBERS[sis.group(2)]) < current:
+            results[course_sis] = past_reason
+        else:
+            results[course_sis] = None
+
+    return results
+
+
 def get_term_from_sws(use_cache=True):
     """
     Get the current term from SWS or from cache if available.
@@ -95,7 +143,9 @@ def get_term_from_sws(use_cache=True):
         if cached_term is not None:
             return cached_term
 
-    # Cache miss or cache disabled - fetch from SWS
+    # Cache miss or cache disabled - fetch from SWS. uw_sws is slow to
+    # import, so it is only loaded when SWS is actually called.
+    from uw_sws import term as sws_term
     current_term = sws_term.get_current_term()
     # Term obj contains weakrefs, so only cache JSON data
     cacheable_current_term = current_term.json_data()
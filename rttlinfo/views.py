@@ -1,24 +1,49 @@
 # Copyright 2026 UWIT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from django.http import HttpResponse
+from django.http import (
+    HttpResponse, HttpResponseNotModified, StreamingHttpResponse)
 from django.views.generic import TemplateView
 from blti.views import BLTILaunchView
 from django.contrib import messages
 from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
 from logging import getLogger
 from .api.repositories.rttl_repository import RttlInfoRepository
 from django.shortcuts import render, redirect
 from .forms import CourseConfigurationForm
-from .api.clients.rttl_client import get_rttl_client, RttlApiError
-from .dataclasses import CourseStatusUpdate
+from .api.clients.rttl_client import (
+    get_rttl_client, RttlApiError, RttlRateLimitError)
+from .dataclasses import (
+    CourseConfiguration, CourseStatusUpdate, format_configuration_diff)
 from .utils import get_course_eligibility
+from .status_poller import long_poll_slot, watch_hub_status
+from .outbox import get_pending_submissions, submit_status
+from .admin_export import export_admin_courses, iter_gzip
+from .capacity import get_capacity_snapshot
+from .idempotency import (
+    SubmissionInProgress, get_idempotency_key, submit_once)
+from .sis_id import SisId
+from .blti_data import get_blti_data, set_blti_data, set_launch_session
+from .fragment_cache import get_fragment_cache_context
+from .hub_data_token import (
+    TOKEN_HEADER, make_hub_data_token, read_hub_data_token)
+from .server_timing import ServerTimingMixin, timed
+from .webhooks import (
+    SIGNATURE_HEADER, WebhookError, apply_event, verify_signature)
+from django.conf import settings
+from django.core import signing
+import hashlib
+import json
+from datetime import datetime
 logger = getLogger(__name__)
 
 
-class LaunchView(BLTILaunchView):
+class LaunchView(ServerTimingMixin, BLTILaunchView):
     template_name = 'rttlinfo/home.html'
 
     def __init__(self, **kwargs):
@@ -31,7 +56,7 @@ class LaunchView(BLTILaunchView):
         # request.is_secure = lambda: True
         # # DEV __ONLY__ ^^
         response = super().dispatch(request, *args, **kwargs)
-        request.session['blti_data'] = {
+        set_blti_data(request, response, {
             'canvas_course_id': self.blti.canvas_course_id,
             'course_sis_id': self.blti.course_sis_id,
             'course_name': self.blti.course_short_name,
@@ -43,10 +68,13 @@ class LaunchView(BLTILaunchView):
             'is_admin': self.blti.is_administrator,
             'user_email': self.blti.user_email,
             'user_full_name': self.blti.user_full_name,
-        }
+        })
 
         return response
 
+    def set_session(self, **kwargs):
+        set_launch_session(self.request, kwargs)
+
     def get_context_data(self, **kwargs):
         _ = super().get_context_data(**kwargs)
 
@@ -63,12 +91,21 @@ class LaunchView(BLTILaunchView):
             'user_email': self.blti.user_email,
             'user_full_name': self.blti.user_full_name,
             'load_hub_data_async': True,  # Flag to trigger AJAX loading
+            'queued_submissions': get_pending_submissions(
+                self.blti.course_sis_id),
+            'hub_data_token': make_hub_data_token({
+                'course_sis_id': self.blti.course_sis_id,
+            }),
         }
 
 
-class HubDataApiView(TemplateView):
+class HubDataApiView(ServerTimingMixin, TemplateView):
     """
     API endpoint for loading hub data asynchronously.
+
+    Responses carry a strong ETag over the JSON payload and a private
+    Cache-Control max-age matching the repository cache TTL, so the
+    browser can revalidate with If-None-Match and receive a 304.
     """
 
     def __init__(self, **kwargs):
@@ -80,9 +117,9 @@ class HubDataApiView(TemplateView):
         return super().dispatch(*args, **kwargs)
 
     def get(self, request, *args, **kwargs):
-        course_sis_id = request.GET.get('course_sis_id')
-
-        if course_sis_id in [None, 'None', '']:
+        try:
+            course_sis_id = SisId.parse(request.GET.get('course_sis_id'))
+        except ValueError:
             return JsonResponse(
                 {'error': 'course_sis_id parameter required'}, status=400)
 
@@ -93,48 +130,131 @@ class HubDataApiView(TemplateView):
             Returns something like:
             [{'id': 11, 'name': 'PSYCH 102 A Au 19, Introduction To Psychology II', 'course_year': 2019, 'course_quarter': 4, 'sis_course_id': '2019-autumn-PSYCH-102-A', 'hub_url': '', 'last_changed': '2025-06-03T15:43:40.363412-07:00', 'latest_status': {'id': 16, 'status': 'requested', 'hub_deployed': False, 'message': 'JupyterHub configuration requested via web form', 'configuration': {'configuration_applied': False, 'cpu_request': 2, 'memory_request': 3, 'storage_request': 4, 'image_uri': 'https://example.com/imagename', 'image_tag': 'main', 'features_request': '', 'gitpuller_targets': [], 'configuration_comments': 'heyhey', 'create_timestamp': '2025-06-03T15:43:40.567793-07:00'}, 'status_added': '2025-06-03T15:43:40.565744-07:00', 'course': 11}, 'in_admin_courses': False}]
             """
-            rttl_hub_exists = False
-            rttl_hub_url = None
-            rttl_hub_deployed = False
-            rttl_hub_status = None
-            rttl_hub_status_message = None
-            rttl_hub_admins = None
-
-            if rttl_data:
-                if 'latest_status' not in rttl_data[0] or not rttl_data[0]['latest_status']:
-                    raise Exception("No latest status found in RTTL data")
-                rttl_hub_exists = True
-                rttl_hub_url = rttl_data[0].get('hub_url')
-                rttl_hub_deployed = rttl_data[0]['latest_status'].get('hub_deployed', False)
-                rttl_hub_status = rttl_data[0]['latest_status'].get('status')
-                rttl_hub_status_message = rttl_data[0]['latest_status'].get(
-                    'message')
-                rttl_hub_admins = rttl_data[0].get('hub_admins', [])
+            hub_data = self.get_hub_data(rttl_data)
+
+            # The hub projection is cheap to fingerprint; if it matches the
+            # one the cached ETag was computed from, a matching validator
+            # can be answered without the eligibility check or encoding.
+            fingerprint = self._digest(hub_data)
+            etag_cache_key = course_sis_id.cache_key('hub_data_etag')
+            cached_etag = cache.get(etag_cache_key)
+            if cached_etag and cached_etag[0] == fingerprint:
+                etag = cached_etag[1]
+                if self._etag_matches(request, etag):
+                    return self._cache_headers(
+                        HttpResponseNotModified(), etag)
 
             is_eligible = False
-            if not rttl_hub_exists:
+            if not hub_data['rttl_hub_exists']:
                 try:
                     is_eligible = get_course_eligibility(course_sis_id)
                 except Exception as e:
                     logger.error(
                         f"Error checking course eligibility for "
                         f"{course_sis_id}: {e}")
-
-            return JsonResponse({
-                'rttl_hub_exists': rttl_hub_exists,
-                'rttl_hub_url': rttl_hub_url,
-                'rttl_hub_deployed': rttl_hub_deployed,
-                'rttl_hub_status': rttl_hub_status,
-                'rttl_hub_status_message': rttl_hub_status_message,
-                'rttl_hub_admins': rttl_hub_admins,
-                'is_eligible': is_eligible,
-            })
-
+            hub_data['is_eligible'] = is_eligible
+
+            with timed('json', 'JSON encoding'):
+                content = json.dumps(hub_data, sort_keys=True)
+            etag = quote_etag(
+                hashlib.md5(content.encode()).hexdigest())
+            cache.set(etag_cache_key, (fingerprint, etag),
+                      timeout=self.rttl_repository.cache_timeout)
+
+            if self._etag_matches(request, etag):
+                return self._cache_headers(HttpResponseNotModified(), etag)
+
+            return self._cache_headers(
+                HttpResponse(content, content_type='application/json'), etag)
+
+        except RttlRateLimitError as e:
+            # Rate limited or shed with nothing cached; ask the page to
+            # retry rather than report a failure
+            response = JsonResponse(
+                {'error': 'Hub data temporarily unavailable'}, status=503)
+            response['Retry-After'] = str(max(1, round(e.retry_after)))
+            return response
         except Exception as e:
             logger.error(f"Error fetching hub data: {e}")
             return JsonResponse({'error': 'Failed to fetch hub data'},
                                 status=500)
 
+    @staticmethod
+    def get_hub_data(rttl_data):
+        """
+        Project the RTTL course list onto the fields the home page needs.
+        """
+        hub_data = {
+            'rttl_hub_exists': False,
+            'rttl_hub_url': None,
+            'rttl_hub_deployed': False,
+            'rttl_hub_status': None,
+            'rttl_hub_status_message': None,
+            'rttl_hub_admins': None,
+        }
+
+        if rttl_data:
+            latest_status = rttl_data[0].get('latest_status')
+            if not latest_status:
+                raise Exception("No latest status found in RTTL data")
+            hub_data.update({
+                'rttl_hub_exists': True,
+                'rttl_hub_url': rttl_data[0].get('hub_url'),
+                'rttl_hub_deployed': latest_status.get('hub_deployed', False),
+                'rttl_hub_status': latest_status.get('status'),
+                'rttl_hub_status_message': latest_status.get('message'),
+                'rttl_hub_admins': rttl_data[0].get('hub_admins', []),
+            })
+
+        return hub_data
+
+    @staticmethod
+    def _digest(data):
+        return hashlib.md5(repr(sorted(data.items())).encode()).hexdigest()
+
+    @staticmethod
+    def _etag_matches(request, etag):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if not if_none_match:
+            return False
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+
+    def _cache_headers(self, response, etag):
+        response['ETag'] = etag
+        patch_cache_control(response, private=True,
+                            max_age=self.rttl_repository.cache_timeout)
+        return response
+
+
+class HubDataTokenApiView(HubDataApiView):
+    """
+    Hub data endpoint authorized by the signed token minted on the launch
+    page, sent in the X-RTTL-Token header, rather than by the session.
+
+    SessionlessApiMiddleware serves this view ahead of the session and
+    LTI authentication middleware, so a request does no session I/O.
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            token_sis_id = read_hub_data_token(
+                request.META.get(TOKEN_HEADER, ''))
+        except signing.BadSignature:
+            return JsonResponse({'error': 'Invalid or expired token'},
+                                status=403)
+
+        try:
+            authorized = SisId.parse(token_sis_id) == SisId.parse(
+                request.GET.get('course_sis_id'))
+        except ValueError:
+            authorized = False
+        if not authorized:
+            return JsonResponse(
+                {'error': 'Token is not valid for this course'}, status=403)
+
+        return super().get(request, *args, **kwargs)
+
 
 class HubManageView(TemplateView):
     template_name = 'rttlinfo/manage.html'
@@ -146,16 +266,11 @@ class HubManageView(TemplateView):
         self.rttl_repository = RttlInfoRepository()
 
     def get_context_data(self, **kwargs):
-        _ = super().get_context_data(**kwargs)
-        querystring = self.request.environ.get('QUERY_STRING')
-        q_list = querystring.split('&')
-        course_sis_id = None
-        for q in q_list:
-            q_split = q.split('=')
-            if q_split[0] == 'course_sis_id':
-                course_sis_id = q_split[1]
-                break
-        if not course_sis_id:
+        context = super().get_context_data(**kwargs)
+        try:
+            course_sis_id = SisId.parse(
+                self.request.GET.get('course_sis_id'))
+        except ValueError:
             return HttpResponse(status=400, content='Missing course_sis_id')
         rttl_data = self.rttl_repository.get_course_status(course_sis_id)
         """
@@ -166,14 +281,17 @@ class HubManageView(TemplateView):
             # Must be a new hub request
             pass
 
+        return context
+
 
-class HubRequestView(TemplateView):
+class HubRequestView(ServerTimingMixin, TemplateView):
     template_name = 'rttlinfo/request.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['blti_data'] = self.request.session.get('blti_data', {})
+        context['blti_data'] = get_blti_data(self.request)
         context['form'] = CourseConfigurationForm()
+        context.update(get_fragment_cache_context(context['blti_data']))
         # Alt for a full hub request with course info:
         # context['form'] = HubRequestForm()
 
@@ -187,13 +305,13 @@ class HubRequestView(TemplateView):
             logger.debug("Form is valid, processing...")
             try:
                 # Get BLTI data from session
-                blti_data = request.session.get('blti_data', {})
+                blti_data = get_blti_data(request)
                 sis_course_id = blti_data.get('course_sis_id')
 
                 if not sis_course_id:
                     messages.error(request, 'Unable to identify course. \
                     Please try launching from Canvas again.')
-                    return render(request, self.template_name, {'form': form})
+                    return self.render_to_response({'form': form})
 
                 # Convert form to dataclass
                 config_dataclass = form.to_dataclass()
@@ -226,20 +344,44 @@ class HubRequestView(TemplateView):
                     # Only set if there are any admins provided
                     status_update.hub_admins = hub_admins
 
-                # Use RttlApiClient to submit the request
+                # Queue the request in the outbox, which the background
+                # sender delivers to the RTTL API, collapsing identical
+                # submissions (double clicks, retries, other instructors)
+                # into one entry
                 client = get_rttl_client()
-                response = client.create_or_update_course_status(
-                    status_update.to_api_data())
+                (response, outbox_id), duplicate = submit_once(
+                    get_idempotency_key(
+                        status_update,
+                        (blti_data.get('user_email') or '').split('@')[0]),
+                    lambda: submit_status(
+                        client, status_update.to_api_data()))
+
+                if duplicate:
+                    logger.info(f"Duplicate submission for {sis_course_id}")
+
+                if outbox_id:
+                    logger.info(f"Queued as outbox entry {outbox_id}")
+                    messages.success(
+                        request,
+                        'Your JupyterHub request has been received and '
+                        'queued for submission. You will receive an email '
+                        'notification when your hub is ready.'
+                    )
+                else:
+                    logger.info(f"API response: {response}")
+                    messages.success(
+                        request,
+                        'Your JupyterHub request has been submitted '
+                        'successfully! You will receive an email '
+                        'notification when your hub is ready.'
+                    )
+                return redirect('home')
 
-                logger.info(f"API response: {response}")
-                
-                # Success message
-                messages.success(
+            except SubmissionInProgress:
+                messages.info(
                     request,
-                    'Your JupyterHub request has been submitted successfully! '
-                    'You will receive an email notification when '
-                    'your hub is ready.'
-                )
+                    'An identical JupyterHub request is already being '
+                    'submitted for this course.')
                 return redirect('home')
 
             except RttlApiError as e:
@@ -268,12 +410,23 @@ class HubRequestView(TemplateView):
         # If form is invalid or there was an error, re-render with form errors
         context = self.get_context_data(**kwargs)
         context['form'] = form
-        return render(request, self.template_name, context)
+        return self.render_to_response(context)
 
 
 class HubStatusApiView(TemplateView):
     """
     API endpoint for checking hub status.
+
+    Passing the `status_token` from a previous response turns the request
+    into a long poll that returns as soon as the status changes, or after
+    RTTL_STATUS_WAIT_TIMEOUT seconds. A long poll holds a worker thread,
+    so at most RTTL_STATUS_MAX_WAITERS wait at once per process. Beyond
+    that, and when long polling is disabled, the current status is
+    returned at once with a `retry_after` for the next request. All
+    requests watching a course share one upstream poller.
+
+    Requests are authorized by the hub data token for the course in the
+    X-RTTL-Token header, or by a session launched into the course.
     """
 
     @method_decorator(csrf_exempt)
@@ -281,52 +434,99 @@ class HubStatusApiView(TemplateView):
         return super().dispatch(*args, **kwargs)
 
     def get(self, request, *args, **kwargs):
-        sis_course_id = request.GET.get('sis_course_id')
-
-        if sis_course_id in [None, 'None', '']:
+        try:
+            sis_course_id = SisId.parse(request.GET.get('sis_course_id'))
+        except ValueError:
             return JsonResponse(
                 {'error': 'sis_course_id parameter required'}, status=400)
 
+        if not self._authorized(request, sis_course_id):
+            return JsonResponse(
+                {'error': 'Not authorized for this course'}, status=403)
+
+        since = request.GET.get('status_token')
+        interval = getattr(settings, 'RTTL_STATUS_POLL_INTERVAL', 10)
+
         try:
-            client = get_rttl_client()
-            course_data = client.get_course_by_sis_id(sis_course_id)
+            with watch_hub_status(sis_course_id) as poller, \
+                    long_poll_slot() as waiting:
+                if since and waiting:
+                    token, status = poller.wait_for_change(
+                        since, getattr(
+                            settings, 'RTTL_STATUS_WAIT_TIMEOUT', 10))
+                else:
+                    # Waits only for the poller's first lookup
+                    token, status = poller.wait_for_change(None, interval)
 
-            if not course_data:
+            if token is None:
+                return JsonResponse(
+                    {'error': 'Status not yet available'}, status=503)
+
+            if not status:
                 return JsonResponse({'error': 'Course not found'}, status=404)
 
-            # Get the latest status
-            latest_status = course_data.get('latest_status')
-            if latest_status:
-                return JsonResponse({
-                    'status': latest_status['status'],
-                    'hub_deployed': latest_status.get('hub_deployed', False),
-                    'message': latest_status.get('message', ''),
-                    'hub_url': course_data.get('hub_url', ''),
-                    'last_updated': latest_status.get('status_added')
-                })
-            else:
-                return JsonResponse({
-                    'status': 'unknown',
-                    'message': 'No status information available'
-                })
-
-        except RttlApiError as e:
-            logger.error(f"API error: {e}")
-            return JsonResponse({'error': 'API error occurred'}, status=500)
+            if since and not waiting:
+                response = JsonResponse(dict(
+                    status, status_token=token, retry_after=interval))
+                response['Retry-After'] = str(interval)
+                return response
+            return JsonResponse(dict(status, status_token=token))
+
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             return JsonResponse({'error': 'Internal server error'}, status=500)
 
+    @staticmethod
+    def _authorized(request, sis_course_id):
+        try:
+            authorized_sis_id = read_hub_data_token(
+                request.META.get(TOKEN_HEADER, ''))
+        except signing.BadSignature:
+            authorized_sis_id = get_blti_data(request).get('course_sis_id')
+        try:
+            return SisId.parse(authorized_sis_id) == sis_course_id
+        except ValueError:
+            return False
+
+
+class RttlWebhookApiView(TemplateView):
+    """
+    Webhook for course and status change events from the RTTL side, signed
+    with RTTL_WEBHOOK_SECRET, which update the cached course status as
+    soon as it changes instead of when its cache entry expires.
+    """
+    http_method_names = ['post']
+
+    @method_decorator(csrf_exempt)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            verify_signature(request.body, request.META.get(SIGNATURE_HEADER))
+            try:
+                event = json.loads(request.body)
+            except ValueError:
+                raise WebhookError('Invalid JSON')
+            return JsonResponse({'result': apply_event(event)})
+
+        except WebhookError as e:
+            return JsonResponse({'error': e.message}, status=e.status_code)
+        except Exception as e:
+            logger.error(f"Error applying webhook event: {e}")
+            return JsonResponse({'error': 'Internal server error'}, status=500)
+
 
 # Helper view for updating existing configurations
 # Check if needed
+# Not routed in urls.py, and rttlinfo/update_config.html does not exist yet
 class HubUpdateConfigView(TemplateView):
     template_name = 'rttlinfo/update_config.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        blti_data = self.request.session.get('blti_data', {})
+        blti_data = get_blti_data(self.request)
         sis_course_id = blti_data.get('lis_course_offering_sourcedid')
 
         if sis_course_id:
@@ -336,16 +536,15 @@ class HubUpdateConfigView(TemplateView):
 
                 if course_data:
                     # Get the applied configuration
-                    configs = client.list_course_configs(
-                        course_data['id'],
-                        applied=True)
-                    if configs:
+                    applied_config = self.get_applied_config(
+                        client, course_data)
+                    if applied_config:
                         # Pre-populate form with existing configuration
                         form = CourseConfigurationForm()
                         # Use the applied config
-                        form.from_dataclass(configs[0])
+                        form.from_dataclass(applied_config)
                         context['form'] = form
-                        context['existing_config'] = configs[0]
+                        context['existing_config'] = applied_config
                     else:
                         context['form'] = CourseConfigurationForm()
 
@@ -362,12 +561,22 @@ class HubUpdateConfigView(TemplateView):
 
         return context
 
+    @staticmethod
+    def get_applied_config(client, course_data):
+        """
+        Return the applied CourseConfiguration for a course, or None.
+        """
+        configs = client.list_course_configs(course_data['id'], applied=True)
+        if not configs:
+            return None
+        return CourseConfiguration.from_api_data(configs[0])
+
     def post(self, request, *args, **kwargs):
         form = CourseConfigurationForm(request.POST)
 
         if form.is_valid():
             try:
-                blti_data = request.session.get('blti_data', {})
+                blti_data = get_blti_data(request)
                 sis_course_id = blti_data.get('lis_course_offering_sourcedid')
 
                 if not sis_course_id:
@@ -377,28 +586,64 @@ class HubUpdateConfigView(TemplateView):
                 # Convert form to dataclass
                 config_dataclass = form.to_dataclass()
 
+                # Compare with the applied configuration, and skip the
+                # upstream write if nothing that affects the hub changed.
+                # Cached lookups may predate a change made elsewhere.
+                client = get_rttl_client(use_cache=False)
+                message = 'Configuration updated via web form'
+                course_data = client.get_course_by_sis_id(sis_course_id)
+                applied_config = course_data and self.get_applied_config(
+                    client, course_data)
+                if applied_config:
+                    changes = config_dataclass.diff(applied_config)
+                    if not changes:
+                        logger.info(f"Configuration for {sis_course_id} is "
+                                    f"unchanged, not submitting")
+                        messages.info(
+                            request,
+                            'The configuration matches the one already '
+                            'applied, so no update was submitted.')
+                        return redirect('hub-manage')
+                    changes = format_configuration_diff(changes)
+                    logger.info(f"Configuration changes for "
+                                f"{sis_course_id}: {changes}")
+                    message = f"{message}. Changes: {changes}"
+
                 # Create a new status with updated configuration
                 status_update = CourseStatusUpdate(
                     sis_course_id=sis_course_id,
                     status='requested',  # Status for configuration update
                     auto_create=False,   # Course should already exist
                     hub_deployed=False,
-                    message='Configuration updated via web form',
+                    message=message,
                     configuration=config_dataclass,
                     status_added_by=blti_data.get('user_email', ''),
                     status_added_by_full_name=blti_data.get('user_full_name',
                                                             '')
                 )
 
-                # Submit the update
-                client = get_rttl_client()
-                _ = client.create_or_update_course_status(
-                    status_update.to_api_data())
+                # Queue the update in the outbox
+                (_, outbox_id), _ = submit_once(
+                    get_idempotency_key(status_update),
+                    lambda: submit_status(
+                        client, status_update.to_api_data()))
+
+                if outbox_id:
+                    messages.success(
+                        request,
+                        f'Configuration update queued for submission. '
+                        f'{message}')
+                else:
+                    messages.success(
+                        request,
+                        f'Configuration updated successfully! {message}')
+                return redirect('hub-manage')
 
-                messages.success(
+            except SubmissionInProgress:
+                messages.info(
                     request,
-                    'Configuration updated successfully!')
-                return redirect('hub-manage')
+                    'An identical configuration update is already being '
+                    'submitted.')
 
             except RttlApiError as e:
                 logger.error(f"API error: {e}")
@@ -412,7 +657,7 @@ class HubUpdateConfigView(TemplateView):
         return render(request, self.template_name, {'form': form})
 
 
-class HomeView(TemplateView):
+class HomeView(ServerTimingMixin, TemplateView):
     """
     Simple home view that uses session data instead of LTI validation.
     Used for redirects after form submissions.
@@ -423,7 +668,7 @@ class HomeView(TemplateView):
         context = super().get_context_data(**kwargs)
 
         # Get BLTI data from session (stored during initial LTI launch)
-        blti_data = self.request.session.get('blti_data', {})
+        blti_data = get_blti_data(self.request)
 
         # Return context similar to LaunchView but using session data
         context.update({
@@ -438,6 +683,68 @@ class HomeView(TemplateView):
             'is_admin': blti_data.get('is_admin', False),
             'is_eligible': blti_data.get('is_eligible', False),
             'load_hub_data_async': True,  # Flag to trigger AJAX loading
+            'queued_submissions': get_pending_submissions(
+                blti_data.get('course_sis_id')),
+            'hub_data_token': make_hub_data_token(blti_data),
         })
 
         return context
+
+
+class AdminExportView(TemplateView):
+    """
+    Streams every admin course with its hub settings, for capacity
+    planning, as NDJSON or as CSV with ?format=csv. The response is
+    gzipped if the client accepts it. LTI administrators only.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not get_blti_data(request).get('is_admin'):
+            return JsonResponse({'error': 'Administrator access required'},
+                                status=403)
+
+        export_format = 'csv' if request.GET.get('format') == 'csv' \
+            else 'ndjson'
+        chunks = export_admin_courses(
+            get_rttl_client(use_cache=False, background=True),
+            export_format, getattr(settings, 'RTTL_EXPORT_CONCURRENCY', 4))
+        content_type = 'text/csv' if export_format == 'csv' \
+            else 'application/x-ndjson'
+
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = StreamingHttpResponse(
+                iter_gzip(chunks), content_type=content_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = StreamingHttpResponse(
+                chunks, content_type=content_type)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Content-Disposition'] = \
+            f'attachment; filename="admin-courses.{export_format}"'
+        return response
+
+
+class CapacityDashboardView(TemplateView):
+    """
+    Operator dashboard of the cpu, memory and storage requested per term,
+    from the cached capacity snapshot. LTI administrators only.
+    """
+    template_name = 'rttlinfo/capacity.html'
+
+    def get(self, request, *args, **kwargs):
+        if not get_blti_data(request).get('is_admin'):
+            return HttpResponse(status=403,
+                                content='Administrator access required')
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            snapshot = get_capacity_snapshot()
+            context['snapshot'] = dict(
+                snapshot, refreshed=datetime.fromtimestamp(
+                    snapshot['refreshed']))
+        except Exception as e:
+            logger.error(f"Error loading capacity snapshot: {e}")
+            context['error'] = 'Unable to load course capacity data'
+        return context
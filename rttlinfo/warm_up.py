@@ -0,0 +1,58 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import threading
+import time
+from logging import getLogger
+from django.conf import settings
+from .api.clients.rttl_client import get_rttl_client
+from .term_calendar import get_term_calendar
+logger = getLogger(__name__)
+
+_warm_up_thread = None
+_warm_up_pid = None
+_warm_up_lock = threading.Lock()
+
+
+def warm_up():
+    """
+    Do the work a cold worker would otherwise do on its first requests:
+    load the term calendar (refreshing it from SWS if there is none) and
+    open RTTL_WARM_UP_CONNECTIONS pooled connections to the RTTL API.
+    Failures are logged, as the first requests will simply retry them.
+    """
+    start = time.perf_counter()
+    try:
+        get_term_calendar().get_current_term()
+    except Exception as e:
+        logger.warning(f"Error loading term calendar during warm-up: {e}")
+    term_elapsed = time.perf_counter() - start
+
+    connections = 0
+    try:
+        connections = get_rttl_client().warm_up(
+            getattr(settings, 'RTTL_WARM_UP_CONNECTIONS', 2))
+    except Exception as e:
+        logger.warning(f"Error connecting to RTTL API during warm-up: {e}")
+
+    logger.info(f"Warm-up: term calendar {term_elapsed:.2f}s, "
+                f"{connections} RTTL API connections, "
+                f"{time.perf_counter() - start:.2f}s total")
+
+
+def start_warm_up():
+    """
+    Run warm_up() in a background thread, once per process (a forked
+    worker runs its own, as connections are not shared). Call from
+    a gunicorn post_fork hook, or set RTTL_WARM_UP to have
+    RttlInfoConfig.ready() call it.
+    """
+    global _warm_up_thread, _warm_up_pid
+    with _warm_up_lock:
+        if _warm_up_thread is None or _warm_up_pid != os.getpid():
+            _warm_up_pid = os.getpid()
+            _warm_up_thread = threading.Thread(
+                target=warm_up, daemon=True, name="rttl-warm-up")
+            _warm_up_thread.start()
+        return _warm_up_thread
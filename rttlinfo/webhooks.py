@@ -0,0 +1,158 @@
+# Copyright 2026 UWIT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import hmac
+import time
+from datetime import datetime
+from logging import getLogger
+from django.conf import settings
+from django.core.cache import cache
+from .api.repositories.rttl_repository import RttlInfoRepository
+from .sis_id import SisId
+logger = getLogger(__name__)
+
+SIGNATURE_HEADER = 'HTTP_X_RTTL_SIGNATURE'
+COURSE_UPDATED = 'course.updated'
+COURSE_DELETED = 'course.deleted'
+STATUS_CREATED = 'status.created'
+
+APPLIED = 'applied'
+DUPLICATE = 'duplicate'
+OUT_OF_ORDER = 'out_of_order'
+
+# Event ids and course versions are remembered this long, which should
+# exceed the sender's retry window
+EVENT_TIMEOUT = 60 * 60 * 24 * 7
+
+
+class WebhookError(Exception):
+    """
+    A webhook request that cannot be accepted, with the HTTP status to
+    answer it with.
+    """
+    def __init__(self, message, status_code=400):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(message)
+
+
+def sign_webhook(body, secret, timestamp=None):
+    """
+    The X-Rttl-Signature header value for a request body:
+    't=<unix time>,v1=<hex HMAC-SHA256 of "<unix time>.<body>">'.
+    """
+    timestamp = int(time.time() if timestamp is None else timestamp)
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body,
+                      hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(body, header):
+    """
+    Check a request body against its X-Rttl-Signature header, signed with
+    RTTL_WEBHOOK_SECRET no more than RTTL_WEBHOOK_TOLERANCE seconds ago.
+    Raises WebhookError if it does not match.
+    """
+    secret = getattr(settings, 'RTTL_WEBHOOK_SECRET', None)
+    if not secret:
+        raise WebhookError('Webhooks are not configured', 404)
+
+    try:
+        parts = dict(part.split('=', 1) for part in header.split(','))
+        timestamp = int(parts['t'])
+        signature = parts['v1']
+    except (AttributeError, KeyError, ValueError):
+        raise WebhookError('Missing or malformed signature', 401)
+
+    if abs(time.time() - timestamp) > getattr(
+            settings, 'RTTL_WEBHOOK_TOLERANCE', 300):
+        raise WebhookError('Signature timestamp out of tolerance', 401)
+    expected = sign_webhook(body, secret, timestamp).split('v1=', 1)[1]
+    if not hmac.compare_digest(expected, signature):
+        raise WebhookError('Invalid signature', 401)
+
+
+def get_course_version(course, deleted=False):
+    """
+    Order of a course record's versions: its latest status id, then its
+    last_changed time, then whether it has been deleted.
+    """
+    status = course.get('latest_status') or {}
+    last_changed = course.get('last_changed')
+    try:
+        changed = datetime.fromisoformat(last_changed).timestamp() \
+            if last_changed else 0
+    except ValueError:
+        changed = 0
+    return (status.get('id') or 0, changed, int(deleted))
+
+
+def apply_event(event, repository=None):
+    """
+    Apply a course change event to the cache:
+
+        {"id": "<unique event id>",
+         "type": "course.updated" | "status.created" | "course.deleted",
+         "course": {<course record as listed by the RTTL API, with
+                     sis_course_id, last_changed and latest_status>}}
+
+    Updated course records replace the cached course status, and the
+    course's details and configs are dropped to be refetched. Events
+    already seen, and events for an older version of the course than one
+    already applied, are skipped. Returns APPLIED, DUPLICATE or
+    OUT_OF_ORDER.
+    """
+    try:
+        event_id = str(event['id'])
+        event_type = event['type']
+        course = event['course']
+        sis_id = SisId.parse(course['sis_course_id'])
+    except (KeyError, TypeError, ValueError):
+        raise WebhookError('Malformed event')
+    if event_type not in (COURSE_UPDATED, COURSE_DELETED, STATUS_CREATED):
+        raise WebhookError(f'Unknown event type {event_type}')
+    if event_type != COURSE_DELETED and \
+            not isinstance(course.get('latest_status'), dict):
+        # The hub data views cannot show a course without one
+        raise WebhookError('Course has no latest_status')
+
+    event_key = 'rttl_webhook_event_' + \
+        hashlib.md5(event_id.encode()).hexdigest()
+    if not cache.add(event_key, 1, timeout=EVENT_TIMEOUT):
+        return DUPLICATE
+
+    # Serialize events for a course, so the version check and the update
+    # are not interleaved with another event's
+    lock_key = sis_id.cache_key('rttl_webhook_lock')
+    if not cache.add(lock_key, 1, timeout=10):
+        cache.delete(event_key)
+        raise WebhookError('Another event for the course is being applied',
+                           409)
+    try:
+        version_key = sis_id.cache_key('rttl_webhook_version')
+        version = get_course_version(
+            course, deleted=event_type == COURSE_DELETED)
+        applied = cache.get(version_key)
+        if applied is not None and not course.get('latest_status'):
+            # A deleted course without a status is ordered by last_changed
+            version = (applied[0],) + version[1:]
+        if applied is not None and version <= tuple(applied):
+            logger.info(f"Skipping out of order {event_type} event "
+                        f"{event_id} for {sis_id}")
+            return OUT_OF_ORDER
+
+        repository = repository or RttlInfoRepository()
+        if event_type == COURSE_DELETED:
+            repository.replace_course_status(sis_id, [])
+        else:
+            repository.replace_course_status(sis_id, [course])
+        cache.set(version_key, version, timeout=EVENT_TIMEOUT)
+        logger.info(f"Applied {event_type} event {event_id} for {sis_id}")
+        return APPLIED
+    except Exception:
+        # Let the sender's retry apply it
+        cache.delete(event_key)
+        raise
+    finally:
+        cache.delete(lock_key)